@@ -3,7 +3,6 @@ import csv
 import json
 import uuid
 import shutil
-import subprocess
 import re
 import math
 import zipfile
@@ -16,17 +15,23 @@ from io import BytesIO
 import tempfile
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from pathlib import Path
 import logging
-from flask import Flask, render_template, request, jsonify, send_file, session, after_this_request
+from flask import Flask, render_template, request, jsonify, send_file, send_from_directory, session, after_this_request
 import pandas as pd
 import numpy as np
 import openpyxl
+from openpyxl.cell.cell import Cell
 from openpyxl.worksheet.formula import ArrayFormula
-from openpyxl.utils.cell import range_boundaries, column_index_from_string
+from openpyxl.utils.cell import range_boundaries, column_index_from_string, get_column_letter
 from werkzeug.utils import secure_filename
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used without it
+    orjson = None
 
 logging.basicConfig(level=logging.INFO)
 app = Flask(__name__)
@@ -38,15 +43,28 @@ dashboard_jobs = {}
 dashboard_jobs_lock = threading.Lock()
 summary_jobs = {}
 summary_jobs_lock = threading.Lock()
+# progress.json contents per job, keyed by path and validated against the file's stat signature
+_progress_cache = {}
+_progress_cache_lock = threading.Lock()
+_PROGRESS_CACHE_SIZE = 256
+_progress_write_lock = threading.Lock()
+# Parsed job JSON files and rate card globs, validated against file/directory stat signatures
+_job_file_cache = {}
+_job_file_cache_lock = threading.Lock()
+_JOB_FILE_CACHE_SIZE = 512
+# Column subsets of recent jobs' normalized frames, validated against the file's stat signature
+_normalized_frame_cache = {}
+_normalized_frame_cache_lock = threading.Lock()
+_NORMALIZED_FRAME_CACHE_SIZE = 8
+# Selection-independent metrics inputs per job, validated against the source file mtimes
+_fast_inputs_cache = {}
+_fast_inputs_cache_lock = threading.Lock()
 carrier_details_jobs = {}
 carrier_details_jobs_lock = threading.Lock()
 
 # Template caching - load once at startup to avoid 25s load time per generation
 _template_cache = {}
 _template_cache_lock = threading.Lock()
-# Pre-parsed workbook cache for fast generation - stores actual parsed workbook
-_parsed_workbook_cache = {}
-_parsed_workbook_cache_lock = threading.Lock()
 
 # Rate tables cache - avoid re-parsing Excel on every dashboard call
 _rate_tables_cache = {}
@@ -54,6 +72,97 @@ _rate_tables_cache_lock = threading.Lock()
 _pricing_controls_cache = {}
 _pricing_controls_cache_lock = threading.Lock()
 
+# Filesystem timestamps are coarse, so a second write within the same tick (possibly from
+# another worker process) can leave mtime/size unchanged; signatures that recent are not trusted.
+_STAT_RACE_WINDOW_NS = 2_000_000_000
+
+def _stat_signature(path):
+    """(mtime_ns, size, inode) for cache validation, or None while the mtime is too recent to trust.
+
+    Raises FileNotFoundError when path is missing.
+    """
+    st = os.stat(path)
+    if time.time_ns() - st.st_mtime_ns < _STAT_RACE_WINDOW_NS:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _json_loads(data):
+    """json.loads() replacement that parses str or bytes with orjson when it is installed."""
+    if orjson is None:
+        return json.loads(data)
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # stdlib json.dump writes NaN/Infinity literals that orjson rejects
+        return json.loads(data)
+
+def _json_load(f):
+    """json.load() replacement that parses with orjson when it is installed."""
+    if orjson is None:
+        return json.load(f)
+    return _json_loads(f.read())
+
+def _json_dumps_bytes(obj):
+    """Serialize obj to UTF-8 JSON bytes, via orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj).encode('utf-8')
+
+def _json_dump(obj, f):
+    """json.dump() replacement for small state files such as progress.json."""
+    f.write(_json_dumps_bytes(obj).decode('utf-8'))
+
+def _load_job_json(path):
+    """Parse a job JSON file, reusing the parsed copy while the file is unchanged."""
+    path = Path(path)
+    try:
+        signature = _stat_signature(path)
+    except FileNotFoundError:
+        return {}
+    cache_key = ('json', str(path))
+    cached = _cached_job_file(cache_key, signature)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    data = _json_loads(path.read_bytes())
+    _remember_job_file(cache_key, copy.deepcopy(data), signature)
+    return data
+
+def _rate_card_files(job_dir):
+    """job_dir.glob('* - Rate Card*.xlsx'), re-run only when the directory changes."""
+    job_dir = Path(job_dir)
+    try:
+        signature = _stat_signature(job_dir)
+    except FileNotFoundError:
+        return []
+    cache_key = ('rate_cards', str(job_dir))
+    cached = _cached_job_file(cache_key, signature)
+    if cached is not None:
+        return list(cached)
+    files = list(job_dir.glob('* - Rate Card*.xlsx'))
+    _remember_job_file(cache_key, files, signature)
+    return list(files)
+
+def _cached_job_file(cache_key, signature):
+    if signature is None:
+        return None
+    with _job_file_cache_lock:
+        cached = _job_file_cache.get(cache_key)
+        if cached and cached['signature'] == signature:
+            return cached['data']
+    return None
+
+def _remember_job_file(cache_key, data, signature):
+    with _job_file_cache_lock:
+        _job_file_cache.pop(cache_key, None)
+        if signature is None:
+            return
+        _job_file_cache[cache_key] = {'data': data, 'signature': signature}
+        while len(_job_file_cache) > _JOB_FILE_CACHE_SIZE:
+            _job_file_cache.pop(next(iter(_job_file_cache)))
+
 def _get_cached_template():
     """Get the template workbook from cache, loading if needed."""
     global _template_cache
@@ -81,54 +190,16 @@ def _get_cached_template():
         return BytesIO(template_bytes)
 
 def _get_parsed_workbook():
-    """Get a pre-parsed template workbook for fast generation.
-    
-    Caches the parsed workbook and returns a deep copy for each call.
-    This is MUCH faster (~2s) than re-parsing the workbook each time (~24s).
+    """Parse a fresh copy of the template workbook for one generation (~24s).
+
+    Parsed from the in-memory template bytes. A pickled snapshot of the parsed
+    workbook is ~270 MB per worker and only saves ~8s per job, so none is kept.
     """
-    global _parsed_workbook_cache
-    template_path = Path('#New Template - Rate Card.xlsx')
-    if not template_path.exists():
-        template_path = Path('Rate Card Template.xlsx')
-    if not template_path.exists():
-        raise FileNotFoundError("Template file not found")
-    
-    cache_key = str(template_path)
-    current_mtime = template_path.stat().st_mtime
-    
-    with _parsed_workbook_cache_lock:
-        cached = _parsed_workbook_cache.get(cache_key)
-        if cached and cached.get('mtime') == current_mtime:
-            # Return deep copy of cached workbook (~2s vs 24s parsing)
-            copy_start = time.time()
-            wb_copy = copy.deepcopy(cached['workbook'])
-            logging.info(f"Workbook deepcopy time: {time.time() - copy_start:.1f}s")
-            return wb_copy
-        
-        # Parse workbook for the first time (slow, ~24s)
-        logging.info("Parsing template workbook for cache (one-time cost)...")
-        parse_start = time.time()
-        template_buffer = _get_cached_template()
-        wb = openpyxl.load_workbook(template_buffer, keep_vba=False, data_only=False)
-        logging.info(f"Template parse time: {time.time() - parse_start:.1f}s")
-        
-        # Clean up corrupted tables (strings instead of Table objects) before caching
-        from openpyxl.worksheet.table import Table
-        for sheet in wb.worksheets:
-            corrupted_tables = [name for name, tbl in sheet.tables.items() if not isinstance(tbl, Table)]
-            for table_name in corrupted_tables:
-                try:
-                    del sheet.tables[table_name]
-                    logging.warning(f"Removed corrupted table '{table_name}' from cached template sheet '{sheet.title}'")
-                except Exception:
-                    pass
-        
-        _parsed_workbook_cache[cache_key] = {
-            'workbook': wb,
-            'mtime': current_mtime
-        }
-        # Return a copy so the cached version stays pristine
-        return copy.deepcopy(wb)
+    parse_start = time.time()
+    template_buffer = _get_cached_template()
+    wb = openpyxl.load_workbook(template_buffer, keep_vba=False, data_only=False)
+    logging.info(f"Template parse time: {time.time() - parse_start:.1f}s")
+    return wb
 
 def _load_workbook_with_retry(path, attempts=3, delay=0.2, **kwargs):
     """Load a workbook with retries to avoid transient read errors."""
@@ -184,6 +255,31 @@ def _inject_calc_chain(xlsx_path, template_path):
     # Replace original with new file
     shutil.move(temp_output, xlsx_path)
 
+# Any 5-digit run marks a destination as a US ZIP.
+_ZIP5 = re.compile(r'\d{5}')
+_NON_DIGIT = re.compile(r'\D')
+# Deletes every ASCII non-digit; str.translate beats the regex for plain ASCII ZIP text.
+_ASCII_NON_DIGITS = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not chr(c).isdigit()))
+
+def _digits_only(text):
+    """Strip non-digits from text, same result as _NON_DIGIT.sub('', text)."""
+    if text.isascii():
+        return text.translate(_ASCII_NON_DIGITS)
+    return _NON_DIGIT.sub('', text)
+
+# First digit run in a zone label such as "Zone 5" or "05".
+_ZONE_DIGITS = re.compile(r'\d+')
+# ZIP3/ZIP5 tokens and the separators that turn two of them into a range.
+_ZIP_DIGIT_RUN = re.compile(r'\d{3,5}')
+_ZIP_RANGE_SEPARATOR = re.compile(r'(-|–|—|to|thru|through|~|---)', re.IGNORECASE)
+
+# Text normalization patterns shared by the service/carrier/label helpers.
+_NON_WORD_SPACE = re.compile(r'[^\w\s]')
+_NON_WORD_RUN = re.compile(r'\W+')
+_WHITESPACE_RUN = re.compile(r'\s+')
+_PARENTHETICAL = re.compile(r'\([^)]*\)')
+_NON_ALNUM_RUN = re.compile(r'[^a-z0-9]+')
+
 # Thresholds for size/weight classification.
 SMALL_MAX_VOLUME = 1728
 MEDIUM_MAX_VOLUME = 5000
@@ -196,6 +292,11 @@ WEIGHT_CLASS_BREAKS = [
     (10, '5-10'),
     (float('inf'), '10+')
 ]
+# Array forms of the breaks above for np.searchsorted classification of whole columns
+_PACKAGE_SIZE_THRESHOLDS = np.array([SMALL_MAX_VOLUME, MEDIUM_MAX_VOLUME], dtype=np.float64)
+_PACKAGE_SIZE_LABELS = np.array(['SMALL', 'MEDIUM', 'LARGE'], dtype=object)
+_WEIGHT_CLASS_THRESHOLDS = np.array([threshold for threshold, _ in WEIGHT_CLASS_BREAKS[:-1]], dtype=np.float64)
+_WEIGHT_CLASS_LABELS = np.array([label for _, label in WEIGHT_CLASS_BREAKS], dtype=object)
 
 COUNTRY_NAME_TO_CODE = {
     'UNITED STATES': 'US',
@@ -285,6 +386,8 @@ MERCHANT_CARRIERS = ['USPS', 'UPS', 'Amazon', 'FedEx', 'UniUni']
 DASHBOARD_CARRIERS = ['UniUni', 'USPS Market', 'UPS Ground', 'UPS Ground Saver', 'FedEx', 'Amazon']
 FAST_DASHBOARD_METRICS = False
 WEIGHT_BUCKETS = [i / 16 for i in range(1, 16)] + list(range(1, 21))
+# Sorted array form for the vectorized bucket filters in the metrics paths
+_WEIGHT_BUCKETS_ARRAY = np.array(sorted(WEIGHT_BUCKETS), dtype=np.float64)
 
 USPS_ZONE_CACHE = {}
 USPS_ZONE_CACHE_LOCK = threading.Lock()
@@ -416,63 +519,72 @@ AMAZON_ZIP_PATH = BASE_DIR / 'Amazon Zip list  - Zip Code List.csv'
 AMAZON_ZIPS = None
 UNIUNI_ZIP_PATH = BASE_DIR / 'UniUni Qualified Zips.txt'
 UNIUNI_ZIPS = None
+_zip_lists_lock = threading.Lock()
 
 def _load_amazon_zips():
     global AMAZON_ZIPS
-    if AMAZON_ZIPS is not None:
-        if isinstance(AMAZON_ZIPS, dict):
-            return AMAZON_ZIPS
-        if isinstance(AMAZON_ZIPS, (set, list)):
-            zip5 = set(str(z)[:5].zfill(5) for z in AMAZON_ZIPS if str(z).strip())
-            zip3 = {z[:3] for z in zip5 if len(z) >= 3}
-            AMAZON_ZIPS = {'zip5': zip5, 'zip3': zip3}
-            return AMAZON_ZIPS
-    zip5 = set()
-    zip3 = set()
-    if AMAZON_ZIP_PATH.exists():
-        try:
-            with AMAZON_ZIP_PATH.open(newline='', encoding='utf-8', errors='ignore') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    raw = row.get('Zip Code') or ''
-                    digits = re.sub(r'\D', '', str(raw))
-                    if len(digits) < 5:
-                        continue
-                    digits = digits[:5]
-                    zip5.add(digits)
-                    zip3.add(digits[:3])
-        except Exception:
-            zip5 = set()
-            zip3 = set()
-    AMAZON_ZIPS = {'zip5': zip5, 'zip3': zip3}
-    return AMAZON_ZIPS
+    if isinstance(AMAZON_ZIPS, dict):
+        return AMAZON_ZIPS
+    # Double-checked so concurrent first requests parse the list once
+    with _zip_lists_lock:
+        if AMAZON_ZIPS is not None:
+            if isinstance(AMAZON_ZIPS, dict):
+                return AMAZON_ZIPS
+            if isinstance(AMAZON_ZIPS, (set, list)):
+                zip5 = set(str(z)[:5].zfill(5) for z in AMAZON_ZIPS if str(z).strip())
+                zip3 = {z[:3] for z in zip5 if len(z) >= 3}
+                AMAZON_ZIPS = {'zip5': frozenset(zip5), 'zip3': frozenset(zip3)}
+                return AMAZON_ZIPS
+        zip5 = set()
+        zip3 = set()
+        if AMAZON_ZIP_PATH.exists():
+            try:
+                with AMAZON_ZIP_PATH.open(newline='', encoding='utf-8', errors='ignore') as f:
+                    reader = csv.DictReader(f)
+                    for row in reader:
+                        raw = row.get('Zip Code') or ''
+                        digits = _digits_only(str(raw))
+                        if len(digits) < 5:
+                            continue
+                        digits = digits[:5]
+                        zip5.add(digits)
+                        zip3.add(digits[:3])
+            except Exception:
+                zip5 = set()
+                zip3 = set()
+        AMAZON_ZIPS = {'zip5': frozenset(zip5), 'zip3': frozenset(zip3)}
+        return AMAZON_ZIPS
 
 def _load_uniuni_zips():
     global UNIUNI_ZIPS
-    if UNIUNI_ZIPS is not None:
-        if isinstance(UNIUNI_ZIPS, dict):
-            return UNIUNI_ZIPS
-        if isinstance(UNIUNI_ZIPS, (set, list)):
-            zip5 = set(str(z)[:5].zfill(5) for z in UNIUNI_ZIPS if str(z).strip())
-            zip3 = {z[:3] for z in zip5 if len(z) >= 3}
-            UNIUNI_ZIPS = {'zip3': zip3, 'zip5': zip5}
-            return UNIUNI_ZIPS
-    zip3 = set()
-    zip5 = set()
-    if UNIUNI_ZIP_PATH.exists():
-        try:
-            with UNIUNI_ZIP_PATH.open('r', encoding='utf-8-sig', errors='ignore') as f:
-                for line in f:
-                    digits = re.sub(r'\D', '', line.strip())
-                    if len(digits) == 3:
-                        zip3.add(digits)
-                    elif len(digits) == 5:
-                        zip5.add(digits)
-        except Exception:
-            zip3 = set()
-            zip5 = set()
-    UNIUNI_ZIPS = {'zip3': zip3, 'zip5': zip5}
-    return UNIUNI_ZIPS
+    if isinstance(UNIUNI_ZIPS, dict):
+        return UNIUNI_ZIPS
+    # Double-checked so concurrent first requests parse the list once
+    with _zip_lists_lock:
+        if UNIUNI_ZIPS is not None:
+            if isinstance(UNIUNI_ZIPS, dict):
+                return UNIUNI_ZIPS
+            if isinstance(UNIUNI_ZIPS, (set, list)):
+                zip5 = set(str(z)[:5].zfill(5) for z in UNIUNI_ZIPS if str(z).strip())
+                zip3 = {z[:3] for z in zip5 if len(z) >= 3}
+                UNIUNI_ZIPS = {'zip3': frozenset(zip3), 'zip5': frozenset(zip5)}
+                return UNIUNI_ZIPS
+        zip3 = set()
+        zip5 = set()
+        if UNIUNI_ZIP_PATH.exists():
+            try:
+                with UNIUNI_ZIP_PATH.open('r', encoding='utf-8-sig', errors='ignore') as f:
+                    for line in f:
+                        digits = _digits_only(line.strip())
+                        if len(digits) == 3:
+                            zip3.add(digits)
+                        elif len(digits) == 5:
+                            zip5.add(digits)
+            except Exception:
+                zip3 = set()
+                zip5 = set()
+        UNIUNI_ZIPS = {'zip3': frozenset(zip3), 'zip5': frozenset(zip5)}
+        return UNIUNI_ZIPS
 
 def get_working_days_per_year():
     raw = os.getenv('WORKING_DAYS_PER_YEAR', str(DEFAULT_WORKING_DAYS_PER_YEAR))
@@ -482,33 +594,30 @@ def get_working_days_per_year():
         value = DEFAULT_WORKING_DAYS_PER_YEAR
     return value if value > 0 else DEFAULT_WORKING_DAYS_PER_YEAR
 
-def is_amazon_eligible(origin_zip):
-    digits = re.sub(r'\D', '', str(origin_zip or ''))
-    if len(digits) < 3:
-        return False
+def _zip_prefixes(origin_zip):
+    """Return (first5, first3) digit prefixes of a ZIP; either is None when too short."""
+    digits = _digits_only(str(origin_zip or ''))
+    first5 = digits[:5] if len(digits) >= 5 else None
+    first3 = digits[:3] if len(digits) >= 3 else None
+    return first5, first3
+
+def _amazon_prefixes_eligible(first5, first3):
     amazon_zips = _load_amazon_zips()
-    if len(digits) >= 5:
-        digits = digits[:5]
-        if digits in amazon_zips.get('zip5', set()):
-            return True
-        return digits[:3] in amazon_zips.get('zip3', set())
-    return digits[:3] in amazon_zips.get('zip3', set())
+    if first5 is not None and first5 in amazon_zips.get('zip5', set()):
+        return True
+    return first3 is not None and first3 in amazon_zips.get('zip3', set())
 
-def is_uniuni_zip_eligible(origin_zip):
-    digits = re.sub(r'\D', '', str(origin_zip or ''))
-    if not digits:
-        return False
+def _uniuni_prefixes_eligible(first5, first3):
     uniuni_zips = _load_uniuni_zips()
-    zip3 = uniuni_zips.get('zip3', set())
-    zip5 = uniuni_zips.get('zip5', set())
-    if len(digits) >= 5:
-        first5 = digits[:5]
-        if first5 in zip5:
-            return True
-        return first5[:3] in zip3
-    if len(digits) >= 3:
-        return digits[:3] in zip3
-    return False
+    if first5 is not None and first5 in uniuni_zips.get('zip5', set()):
+        return True
+    return first3 is not None and first3 in uniuni_zips.get('zip3', set())
+
+def is_amazon_eligible(origin_zip):
+    return _amazon_prefixes_eligible(*_zip_prefixes(origin_zip))
+
+def is_uniuni_zip_eligible(origin_zip):
+    return _uniuni_prefixes_eligible(*_zip_prefixes(origin_zip))
 
 def _parse_annual_orders(value):
     return _parse_numeric_value(value)
@@ -522,8 +631,10 @@ def compute_eligibility(origin_zip, annual_orders, working_days_per_year=None, m
     
     Explicit overrides in mapping_config can bypass these requirements.
     """
-    zip_eligible_amazon = is_amazon_eligible(origin_zip)
-    zip_eligible_uniuni = is_uniuni_zip_eligible(origin_zip)
+    # Strip the origin ZIP once and check both whitelists against the same prefixes
+    first5, first3 = _zip_prefixes(origin_zip)
+    zip_eligible_amazon = _amazon_prefixes_eligible(first5, first3)
+    zip_eligible_uniuni = _uniuni_prefixes_eligible(first5, first3)
 
     # Check for explicit eligibility overrides in mapping config
     amazon_override = None
@@ -694,10 +805,15 @@ def normalize_service_name(service):
     """Normalize service name for matching"""
     if not service:
         return ""
-    cleaned = strip_after_dash(str(service)).replace('Â', '').replace('®', '')
+    return _normalize_service_text(str(service))
+
+@lru_cache(maxsize=4096)
+def _normalize_service_text(text):
+    # Invoices repeat a few dozen service names, so the regex work is memoized per text
+    cleaned = strip_after_dash(text).replace('Â', '').replace('®', '')
     # Remove punctuation and symbols, collapse whitespace, uppercase
-    normalized = re.sub(r'[^\w\s]', '', cleaned)
-    normalized = re.sub(r'\s+', ' ', normalized)
+    normalized = _NON_WORD_SPACE.sub('', cleaned)
+    normalized = _WHITESPACE_RUN.sub(' ', normalized)
     return normalized.upper().strip()
 
 def clean_shipping_service(service):
@@ -705,14 +821,14 @@ def clean_shipping_service(service):
     if not service:
         return ""
     cleaned = strip_after_dash(str(service)).replace('Â', '').replace('®', '')
-    cleaned = re.sub(r'[^\w\s]', ' ', cleaned)
-    cleaned = re.sub(r'\s+', ' ', cleaned)
+    cleaned = _NON_WORD_SPACE.sub(' ', cleaned)
+    cleaned = _WHITESPACE_RUN.sub(' ', cleaned)
     return cleaned.upper().strip()
 
 def extract_zip5(value):
     if value is None:
         return None
-    zip_match = re.search(r'\d{5}', str(value))
+    zip_match = _ZIP5.search(str(value))
     if zip_match:
         return int(zip_match.group())
     return None
@@ -720,7 +836,7 @@ def extract_zip5(value):
 def extract_origin_zip(value):
     if value is None:
         return None
-    digits = re.sub(r'\D', '', str(value))
+    digits = _digits_only(str(value))
     if not digits:
         return None
     if len(digits) >= 5:
@@ -728,7 +844,7 @@ def extract_origin_zip(value):
     return int(digits)
 
 def _zip3_from_zip(value):
-    digits = re.sub(r'\D', '', str(value or ''))
+    digits = _digits_only(str(value or ''))
     if len(digits) < 3:
         return None
     return digits[:3].zfill(3)
@@ -737,10 +853,10 @@ def _zip3s_from_range(value):
     if value is None:
         return []
     text = str(value)
-    digits = re.findall(r'\d{3,5}', text)
+    digits = _ZIP_DIGIT_RUN.findall(text)
     if not digits:
         return []
-    if len(digits) >= 2 and re.search(r'(-|–|—|to|thru|through|~|---)', text, re.IGNORECASE):
+    if len(digits) >= 2 and _ZIP_RANGE_SEPARATOR.search(text):
         start = int(digits[0][:3])
         end = int(digits[1][:3])
         if end < start:
@@ -759,20 +875,20 @@ def _build_manual_zone_map_604():
         for idx in range(0, len(tokens) - 1, 2):
             zip_token = tokens[idx]
             zone_token = tokens[idx + 1]
-            zone_match = re.search(r'\d+', zone_token)
+            zone_match = _ZONE_DIGITS.search(zone_token)
             if not zone_match:
                 continue
             zone_value = zone_match.group()
             if '---' in zip_token:
                 start_raw, end_raw = zip_token.split('---', 1)
-                start_digits = re.sub(r'\D', '', start_raw)
-                end_digits = re.sub(r'\D', '', end_raw)
+                start_digits = _digits_only(start_raw)
+                end_digits = _digits_only(end_raw)
                 if not start_digits or not end_digits:
                     continue
                 start_zip = int(start_digits[:3])
                 end_zip = int(end_digits[:3])
             else:
-                digits = re.sub(r'\D', '', zip_token)
+                digits = _digits_only(zip_token)
                 if not digits:
                     continue
                 start_zip = end_zip = int(digits[:3])
@@ -788,7 +904,7 @@ def _load_usps_zone_cache():
         return
     try:
         with open(cache_path, 'r') as f:
-            data = json.load(f)
+            data = _json_load(f)
         if isinstance(data, dict):
             USPS_ZONE_CACHE.update(data)
     except Exception:
@@ -853,21 +969,29 @@ def _load_usps_zone_csv_cache():
             zone_col = _choose_zone_column(reader.fieldnames)
             if dest_col is None or zone_col is None:
                 return
+            # The chart repeats each origin prefix across many rows; resolve it once
+            origin_zip3_by_raw = {}
             for row in reader:
                 origin_raw = row.get(origin_col)
-                origin_zip3 = _zip3_from_zip(origin_raw)
+                if origin_raw not in origin_zip3_by_raw:
+                    origin_zip3_by_raw[origin_raw] = _zip3_from_zip(origin_raw)
+                origin_zip3 = origin_zip3_by_raw[origin_raw]
                 if not origin_zip3:
                     continue
                 dest_raw = row.get(dest_col)
                 zone_raw = row.get(zone_col)
                 if not dest_raw or not zone_raw:
                     continue
-                zone_match = re.search(r'\d+', str(zone_raw).strip())
+                zone_match = _ZONE_DIGITS.search(str(zone_raw).strip())
                 if not zone_match:
                     continue
                 zone_value = zone_match.group()
-                for dest_zip3 in _zip3s_from_range(dest_raw):
-                    USPS_ZONE_CACHE.setdefault(origin_zip3, {})[dest_zip3] = zone_value
+                dest_zip3s = _zip3s_from_range(dest_raw)
+                if not dest_zip3s:
+                    continue
+                origin_zones = USPS_ZONE_CACHE.setdefault(origin_zip3, {})
+                for dest_zip3 in dest_zip3s:
+                    origin_zones[dest_zip3] = zone_value
     except Exception:
         return
 
@@ -893,7 +1017,7 @@ def _zone_mapping_from_usps_json(data):
                     break
             if dest_value is None:
                 for value in row.values():
-                    if value and re.search(r'\d{3,5}', str(value)):
+                    if value and _ZIP_DIGIT_RUN.search(str(value)):
                         dest_value = value
                         break
             zone_value = None
@@ -908,10 +1032,12 @@ def _zone_mapping_from_usps_json(data):
                         break
             if not zone_value:
                 continue
+            zone_match = _ZONE_DIGITS.search(str(zone_value).strip())
+            if not zone_match:
+                continue
+            zone_digits = zone_match.group()
             for dest_zip3 in _zip3s_from_range(dest_value):
-                zone_match = re.search(r'\d+', str(zone_value).strip())
-                if zone_match:
-                    mapping[dest_zip3] = zone_match.group()
+                mapping[dest_zip3] = zone_digits
     return mapping
 
 def _fetch_usps_zone_chart_json(origin_zip3):
@@ -1026,7 +1152,10 @@ def classify_weight(weight_lbs):
 
 def infer_redo_carrier(carrier_value, service_value):
     """Infer Redo carrier bucket from carrier/service text."""
-    combined = f"{carrier_value or ''} {service_value or ''}"
+    return _infer_redo_carrier_text(f"{carrier_value or ''} {service_value or ''}")
+
+@lru_cache(maxsize=4096)
+def _infer_redo_carrier_text(combined):
     text = normalize_service_name(combined)
     if not text:
         return None
@@ -1045,22 +1174,38 @@ def infer_redo_carrier(carrier_value, service_value):
         return 'Amazon'
     return None
 
+@lru_cache(maxsize=64)
+def _normalized_column_items(columns):
+    """(match key, original label) pairs for a column tuple; later duplicates of a key win."""
+    normalized = {
+        _NON_WORD_RUN.sub('', str(c).strip().lower()): c for c in columns
+    }
+    return tuple(normalized.items())
+
+def _non_blank_services(raw_df, service_col):
+    services = raw_df[service_col].dropna().astype(str).tolist()
+    return services if any(s.strip() for s in services) else None
+
 def extract_invoice_services(raw_df, mapping_config):
     mapping_value = mapping_config.get('mapping', {}).get('Shipping Service')
-    normalized_cols = {
-        re.sub(r'\W+', '', str(c).strip().lower()): c for c in raw_df.columns
-    }
+    normalized_items = _normalized_column_items(tuple(raw_df.columns))
+    # An exact "Shipping Service" header outscores every other candidate, so try it first
+    for norm, original in normalized_items:
+        if norm == 'shippingservice':
+            services = _non_blank_services(raw_df, original)
+            if services is not None:
+                return services
+            break
+    mapping_norm = _NON_WORD_RUN.sub('', str(mapping_value).strip().lower()) if mapping_value else None
     candidates = []
-    for norm, original in normalized_cols.items():
+    for norm, original in normalized_items:
         score = 0
         if norm == 'shippingservice':
             score += 100
         if 'shipping' in norm and 'service' in norm:
             score += 60
-        if mapping_value:
-            mapping_norm = re.sub(r'\W+', '', str(mapping_value).strip().lower())
-            if norm == mapping_norm:
-                score += 80
+        if mapping_norm is not None and norm == mapping_norm:
+            score += 80
         if score:
             candidates.append((score, original))
     if mapping_value and mapping_value in raw_df.columns:
@@ -1071,32 +1216,34 @@ def extract_invoice_services(raw_df, mapping_config):
     for _, service_col in candidates:
         if service_col not in raw_df.columns:
             continue
-        services = raw_df[service_col].dropna().astype(str).tolist()
-        if any(s.strip() for s in services):
+        services = _non_blank_services(raw_df, service_col)
+        if services is not None:
             return services
     return []
 
 def detect_redo_carriers(raw_df, mapping_config):
     carrier_col = mapping_config.get('mapping', {}).get('Shipping Carrier')
     service_col = mapping_config.get('mapping', {}).get('Shipping Service')
-    detected = set()
-    for _, row in raw_df.iterrows():
-        carrier_val = row.get(carrier_col) if carrier_col in raw_df.columns else None
-        service_val = row.get(service_col) if service_col in raw_df.columns else None
-        inferred = infer_redo_carrier(carrier_val, service_val)
-        if inferred:
-            detected.add(inferred)
+    # Invoices repeat a handful of carrier/service pairs, so classify each distinct pair once
+    pairs = pd.DataFrame({
+        'carrier': raw_df[carrier_col] if carrier_col in raw_df.columns else None,
+        'service': raw_df[service_col] if service_col in raw_df.columns else None
+    }, index=raw_df.index).drop_duplicates()
+    detected = {
+        infer_redo_carrier(carrier_val, service_val)
+        for carrier_val, service_val in zip(pairs['carrier'].tolist(), pairs['service'].tolist())
+    }
     ordered = [c for c in REDO_CARRIERS if c in detected]
     return ordered
 
 def available_merchant_carriers(raw_df, mapping_config):
     carrier_col = mapping_config.get('mapping', {}).get('Shipping Carrier')
-    detected = set()
-    for _, row in raw_df.iterrows():
-        carrier_val = row.get(carrier_col) if carrier_col in raw_df.columns else None
-        normalized = normalize_merchant_carrier(carrier_val)
-        if normalized:
-            detected.add(normalized)
+    if carrier_col in raw_df.columns:
+        carrier_values = raw_df[carrier_col].drop_duplicates().tolist()
+    else:
+        carrier_values = [None] if len(raw_df) else []
+    detected = {normalize_merchant_carrier(carrier_val) for carrier_val in carrier_values}
+    detected.discard('')
     display_map = {
         'USPS': 'USPS',
         'UPS': 'UPS',
@@ -1118,11 +1265,12 @@ def available_merchant_services(raw_df, mapping_config):
     canonical_map = {normalize_service_name(s): s for s in SERVICE_LEVELS}
     seen = set()
     ordered = []
-    for service in services:
+    # Services come back one per invoice row; identical strings normalize identically
+    for service in dict.fromkeys(services):
         if not service:
             continue
         cleaned = str(service).replace('Â', '').replace('®', '').strip()
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = _WHITESPACE_RUN.sub(' ', cleaned)
         norm = normalize_service_name(cleaned)
         if not norm or norm in seen:
             continue
@@ -1133,14 +1281,24 @@ def available_merchant_services(raw_df, mapping_config):
 def normalize_redo_label(label):
     if not label:
         return ""
-    text = re.sub(r'\([^)]*\)', '', strip_after_dash(str(label)))
+    return _normalize_redo_label_text(str(label))
+
+@lru_cache(maxsize=4096)
+def _normalize_redo_label_text(label):
+    text = _PARENTHETICAL.sub('', strip_after_dash(label))
     text = text.replace('Â', '').replace('®', '')
-    text = re.sub(r'[^\w\s]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
+    text = _NON_WORD_SPACE.sub(' ', text)
+    text = _WHITESPACE_RUN.sub(' ', text)
     return text.upper().strip()
 
 def normalize_merchant_carrier(value):
-    text = normalize_redo_label(value)
+    if not value:
+        return ""
+    return _merchant_carrier_key(str(value))
+
+@lru_cache(maxsize=4096)
+def _merchant_carrier_key(value):
+    text = _normalize_redo_label_text(value)
     if not text:
         return ""
     if 'USPS' in text or 'POSTAL' in text:
@@ -1155,51 +1313,49 @@ def normalize_merchant_carrier(value):
         return 'UNIUNI'
     return ""
 
+# Dashboard carrier names and the upper-case selection names stored for redo carriers
+_DASHBOARD_TO_REDO_SELECTION = {
+    'UniUni': 'UNIUNI',
+    'USPS Market': 'USPS MARKET',
+    'UPS Ground': 'UPS GROUND',
+    'UPS Ground Saver': 'UPS GROUND SAVER',
+    'Amazon': 'AMAZON',
+    'FedEx': 'FEDEX'
+}
+
 def _dashboard_selected_from_redo(selected_redo):
-    selected = set()
     if not selected_redo:
-        return selected
-    if 'UniUni' in selected_redo:
-        selected.add('UniUni')
-    if 'USPS Market' in selected_redo:
-        selected.add('USPS Market')
-    if 'UPS Ground' in selected_redo:
-        selected.add('UPS Ground')
-    if 'UPS Ground Saver' in selected_redo:
-        selected.add('UPS Ground Saver')
-    if 'Amazon' in selected_redo:
-        selected.add('Amazon')
-    if 'FedEx' in selected_redo:
-        selected.add('FedEx')
-    return selected
+        return set()
+    return {name for name in _DASHBOARD_TO_REDO_SELECTION if name in selected_redo}
 
 def _redo_selection_from_dashboard(selected_dashboard):
-    selected = set()
     if not selected_dashboard:
-        return selected
-    if 'UniUni' in selected_dashboard:
-        selected.add('UNIUNI')
-    if 'USPS Market' in selected_dashboard:
-        selected.add('USPS MARKET')
-    if 'UPS Ground' in selected_dashboard:
-        selected.add('UPS GROUND')
-    if 'UPS Ground Saver' in selected_dashboard:
-        selected.add('UPS GROUND SAVER')
-    if 'Amazon' in selected_dashboard:
-        selected.add('AMAZON')
-    if 'FedEx' in selected_dashboard:
-        selected.add('FEDEX')
-    return selected
-
-def _read_summary_metrics(ws):
+        return set()
     return {
-        'Est. Merchant Annual Savings': ws['C5'].value,
-        'Est. Redo Deal Size': ws['C6'].value,
-        'Spread Available': ws['C7'].value,
-        '% Orders We Could Win': ws['C11'].value,
-        '% Orders Won W/ Spread': ws['C12'].value
+        redo_name for name, redo_name in _DASHBOARD_TO_REDO_SELECTION.items()
+        if name in selected_dashboard
     }
 
+# Pricing & Summary rows holding the headline metrics in column C
+_SUMMARY_METRIC_ROWS = {
+    5: 'Est. Merchant Annual Savings',
+    6: 'Est. Redo Deal Size',
+    7: 'Spread Available',
+    11: '% Orders We Could Win',
+    12: '% Orders Won W/ Spread'
+}
+
+def _read_summary_metrics(ws):
+    """Read the summary metrics from C5:C12 in one values-only pass."""
+    # Read-only sheets re-parse the sheet XML for every ws['C5']-style lookup
+    metrics = dict.fromkeys(_SUMMARY_METRIC_ROWS.values())
+    rows = ws.iter_rows(min_row=5, max_row=12, min_col=3, max_col=3, values_only=True)
+    for row_idx, row in enumerate(rows, start=5):
+        label = _SUMMARY_METRIC_ROWS.get(row_idx)
+        if label and row:
+            metrics[label] = row[0]
+    return metrics
+
 def _normalize_cell_ref(cell_ref):
     text = str(cell_ref).replace('$', '')
     if '!' in text:
@@ -1520,13 +1676,19 @@ class _FormulaParser:
         if sheet_name:
             target_ws = self.evaluator.workbook[sheet_name]
         min_col, min_row, max_col, max_row = range_boundaries(f"{start_ref}:{end_ref}")
+        # Whole-column/row ranges leave bounds open; close them at the sheet extent like iter_rows does
+        min_col = min_col or 1
+        min_row = min_row or 1
+        max_col = max_col or target_ws.max_column
+        max_row = max_row or target_ws.max_row
+        # Build coordinates from integer row/column indices instead of formatting each cell's coordinate
+        col_prefixes = [get_column_letter(col_idx) for col_idx in range(min_col, max_col + 1)]
+        if sheet_name:
+            col_prefixes = [f"{sheet_name}!{letter}" for letter in col_prefixes]
         values = []
-        for row in target_ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
-            for cell in row:
-                coord = _normalize_cell_ref(cell.coordinate)
-                if sheet_name:
-                    coord = f"{sheet_name}!{coord}"
-                values.append(self.evaluator._eval_cell(coord))
+        for row_idx in range(min_row, max_row + 1):
+            for prefix in col_prefixes:
+                values.append(self.evaluator._eval_cell(f"{prefix}{row_idx}"))
         return values
 
     def _apply_op(self, op, left, right):
@@ -1643,9 +1805,10 @@ def _build_redo_overrides(ws, selected_dashboard):
     selection = _redo_selection_from_dashboard(selected_dashboard)
     stop_titles = {'MERCHANT CARRIERS', 'MERCHANT CARRIER', 'MERCHANT SERVICE LEVELS'}
     overrides = {}
+    use_letter = get_column_letter(use_col)
     for row_idx, label_val in _iter_section_rows(ws, header_row_idx + 1, label_col, stop_titles):
         normalized = normalize_redo_label(label_val)
-        coord = ws.cell(row_idx, use_col).coordinate
+        coord = f"{use_letter}{row_idx}"
         if 'FIRST MILE' in normalized:
             overrides[coord] = 'No'
             continue
@@ -1693,6 +1856,27 @@ CARRIER_PRIORITY = [
     'UPS Ground Saver'
 ]
 
+_CARRIER_PRIORITY_RANK = {carrier: rank for rank, carrier in enumerate(CARRIER_PRIORITY)}
+
+def _priority_carrier_tables(selected_carriers, rate_tables):
+    """(carrier, rate table) pairs in CARRIER_PRIORITY order; unranked carriers keep selection order last."""
+    ordered = sorted(selected_carriers, key=lambda c: _CARRIER_PRIORITY_RANK.get(c, len(CARRIER_PRIORITY)))
+    return [(carrier, rate_tables.get(carrier, {})) for carrier in ordered]
+
+def _redo_winner(carrier_tables, row_idx, zone):
+    """Cheapest carrier for a cell, ties going to the higher-priority carrier; (None, None) when unpriced."""
+    rates = []
+    for carrier, table in carrier_tables:
+        rate = table.get(row_idx, {}).get(zone)
+        if rate is not None:
+            rates.append((carrier, rate))
+    if not rates:
+        return None, None
+    min_rate = min(rate for _, rate in rates)
+    for carrier, rate in rates:
+        if abs(rate - min_rate) < 1e-9:
+            return carrier, min_rate
+
 @lru_cache(maxsize=4)
 def _get_pricing_controls(template_path_str):
     global _pricing_controls_cache
@@ -1720,20 +1904,33 @@ def _get_pricing_controls(template_path_str):
         except Exception:
             pass
     
-    wb = _load_workbook_with_retry(path, data_only=True)
+    # Stream C2:K26 once; read-only sheets re-parse the XML for every ws['K2']-style lookup
+    wb = _load_workbook_with_retry(path, data_only=True, read_only=True)
     ws = wb['Pricing & Summary']
-    controls = {
-        'k2': ws['K2'].value,
-        'g2': ws['G2'].value,
-        'c2': ws['C2'].value,
-        'c19': ws['C19'].value or 0,
-        'c20': ws['C20'].value or 0,
-        'c22': ws['C22'].value or 0,
-        'c23': ws['C23'].value or 0,
-        'c25': ws['C25'].value or 0,
-        'c26': ws['C26'].value or 0
+    values = {
+        row_idx: row
+        for row_idx, row in enumerate(
+            ws.iter_rows(min_row=2, max_row=26, min_col=3, max_col=11, values_only=True), start=2
+        )
     }
     wb.close()
+
+    def _value(col_letter, row_idx):
+        row = values.get(row_idx) or ()
+        offset = column_index_from_string(col_letter) - 3
+        return row[offset] if offset < len(row) else None
+
+    controls = {
+        'k2': _value('K', 2),
+        'g2': _value('G', 2),
+        'c2': _value('C', 2),
+        'c19': _value('C', 19) or 0,
+        'c20': _value('C', 20) or 0,
+        'c22': _value('C', 22) or 0,
+        'c23': _value('C', 23) or 0,
+        'c25': _value('C', 25) or 0,
+        'c26': _value('C', 26) or 0
+    }
     
     # Save to disk cache
     try:
@@ -1774,17 +1971,32 @@ def _load_rate_tables(template_path_str):
             pass
     
     # Parse from Excel (slow, ~25s)
-    wb = _load_workbook_with_retry(path, data_only=True)
+    # Stream rows 145-209 once in read-only mode and slice each carrier's zone columns
+    column_spans = {
+        carrier: (column_index_from_string(start_col), column_index_from_string(end_col))
+        for carrier, (start_col, end_col) in RATE_TABLE_COLUMNS.items()
+    }
+    min_col = min(start_idx for start_idx, _ in column_spans.values())
+    max_col = max(end_idx for _, end_idx in column_spans.values())
+    wb = _load_workbook_with_retry(path, data_only=True, read_only=True)
     ws = wb['Redo Rate Cards']
+    sheet_rows = {
+        row_idx: row
+        for row_idx, row in enumerate(
+            ws.iter_rows(min_row=145, max_row=209, min_col=min_col, max_col=max_col, values_only=True),
+            start=145
+        )
+    }
+    wb.close()
     tables = {}
-    for carrier, (start_col, end_col) in RATE_TABLE_COLUMNS.items():
-        start_idx = column_index_from_string(start_col)
-        end_idx = column_index_from_string(end_col)
+    for carrier, (start_idx, end_idx) in column_spans.items():
         rates = {}
         for row in range(145, 210):
+            row_values = sheet_rows.get(row) or ()
             zone_rates = {}
             for zone, col_idx in enumerate(range(start_idx, end_idx + 1), start=1):
-                value = ws.cell(row, col_idx).value
+                offset = col_idx - min_col
+                value = row_values[offset] if offset < len(row_values) else None
                 if value is None:
                     zone_rates[zone] = None
                 else:
@@ -1794,7 +2006,6 @@ def _load_rate_tables(template_path_str):
                         zone_rates[zone] = None
             rates[row] = zone_rates
         tables[carrier] = rates
-    wb.close()
     
     # Save to disk cache for fast future cold starts
     try:
@@ -1821,27 +2032,26 @@ def _rate_row_for_bucket(weight_bucket):
         return None
     return 159 + lbs
 
+# Rate-table row for every weight bucket, so metrics loops do a dict lookup per group
+BUCKET_TO_ROW = {bucket: _rate_row_for_bucket(bucket) for bucket in WEIGHT_BUCKETS}
+
 def _compute_first_mile_weight(weight_oz, weight_lbs):
     weight_oz = pd.to_numeric(weight_oz, errors='coerce')
     weight_lbs = pd.to_numeric(weight_lbs, errors='coerce')
-    output = pd.Series(np.nan, index=weight_oz.index)
-    oz_mask = weight_oz.notna()
-    if oz_mask.any():
-        oz = weight_oz[oz_mask]
-        output.loc[oz_mask] = np.where(
-            oz < 16,
-            np.ceil(oz).astype(int) / 16,
-            np.ceil(oz / 16).astype(int)
-        )
-    lbs_mask = ~oz_mask & weight_lbs.notna()
-    if lbs_mask.any():
-        lbs = weight_lbs[lbs_mask]
-        output.loc[lbs_mask] = np.where(
-            lbs < 1,
-            np.ceil(lbs * 16).astype(int) / 16,
-            np.ceil(lbs).astype(int)
-        )
-    return output.round(4)
+    oz = weight_oz.to_numpy(dtype=float, na_value=np.nan)
+    lbs = weight_lbs.to_numpy(dtype=float, na_value=np.nan)
+    # Ounces win when present; pounds fall back to the same ounce scale (x16 is exact)
+    total_oz = np.where(np.isnan(oz), lbs * 16, oz)
+    # Under a pound rounds up to the next ounce, otherwise up to the next whole pound
+    buckets = np.where(total_oz < 16, np.ceil(total_oz) / 16, np.ceil(total_oz / 16))
+    return pd.Series(buckets, index=weight_oz.index).round(4)
+
+def _weight_bucket_categorical(weight_bucket):
+    """First-mile weights as a WEIGHT_BUCKETS categorical; NaN or off-grid weights get code -1."""
+    values = np.asarray(weight_bucket, dtype=np.float64)
+    idx = np.minimum(np.searchsorted(_WEIGHT_BUCKETS_ARRAY, values), len(_WEIGHT_BUCKETS_ARRAY) - 1)
+    codes = np.where(_WEIGHT_BUCKETS_ARRAY[idx] == values, idx, -1).astype(np.int8)
+    return pd.Categorical.from_codes(codes, categories=_WEIGHT_BUCKETS_ARRAY)
 
 def _coerce_float(value):
     if value is None or value == '':
@@ -1912,8 +2122,8 @@ def _read_carrier_details_cache(job_dir, source_mtime, selection_key):
     if not cache_path.exists():
         return None
     try:
-        with open(cache_path, 'r') as f:
-            cache = json.load(f)
+        # Parsed copy is reused until the next write bumps the file mtime
+        cache = _load_job_json(cache_path)
         if cache.get('source_mtime') != source_mtime:
             return None
         entries = cache.get('entries', {})
@@ -1928,8 +2138,7 @@ def _write_carrier_details_cache(job_dir, source_mtime, selection_key, details):
     payload = {'source_mtime': source_mtime, 'updated_at': datetime.now(timezone.utc).isoformat(), 'entries': {}}
     if cache_path.exists():
         try:
-            with open(cache_path, 'r') as f:
-                existing = json.load(f)
+            existing = _load_job_json(cache_path)
             if existing.get('source_mtime') == source_mtime:
                 payload = existing
         except Exception:
@@ -1961,25 +2170,165 @@ def _start_carrier_details_cache(job_dir, source_mtime, selection_key, selected_
     _write_carrier_details_cache(job_dir, source_mtime, selection_key, details)
     return details, False
 
-def _mode_or_min(series):
-    series = series.dropna()
-    if series.empty:
-        return None
-    counts = series.value_counts()
+# Strings pd.read_csv reads back as NaN / bool by default
+_CSV_NA_STRINGS = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+})
+_CSV_BOOL_STRINGS = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+
+def _csv_roundtrip_dtypes(df):
+    """Coerce text columns the way pd.read_csv would after a to_csv, without the text round-trip."""
+    out = df.copy(deep=False)
+    for col in out.columns:
+        series = out[col]
+        if series.dtype != object and not pd.api.types.is_string_dtype(series.dtype):
+            continue
+        # Decide per distinct value, then broadcast back through the codes (-1 picks the trailing NaN)
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Series(uniques, dtype=object)
+        is_na = uniques.isin(_CSV_NA_STRINGS).to_numpy()
+        if is_na.all():
+            out[col] = np.full(len(series), np.nan)
+            continue
+        uniques = uniques.where(~is_na, np.nan)
+        missing = is_na.any() or (codes == -1).any()
+        try:
+            numeric = pd.to_numeric(uniques)
+        except (ValueError, TypeError):
+            numeric = None
+        if numeric is not None:
+            if missing:
+                out[col] = np.append(numeric.to_numpy(dtype='float64'), np.nan)[codes]
+            else:
+                out[col] = numeric.to_numpy()[codes]
+            continue
+        present = uniques[~is_na]
+        if present.isin(_CSV_BOOL_STRINGS.keys()).all():
+            flags = uniques.map(_CSV_BOOL_STRINGS).to_numpy(dtype=object)
+            out[col] = np.append(flags, np.nan)[codes] if missing else flags[codes].astype(bool)
+            continue
+        if is_na.any() or series.dtype == object:
+            text = uniques.map(lambda v: v if isinstance(v, str) or pd.isna(v) else str(v)).to_numpy(dtype=object)
+            out[col] = pd.Series(np.append(text, np.nan)[codes], index=series.index, dtype='str')
+    return out
+
+def _write_normalized_frame(job_dir, normalized_df):
+    job_dir = Path(job_dir)
+    normalized_df.to_csv(job_dir / 'normalized.csv', index=False)
+    # Parquet copy for internal re-reads; the CSV stays for downloads.
+    parquet_path = job_dir / 'normalized.parquet'
+    try:
+        parquet_path.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        _csv_roundtrip_dtypes(normalized_df).to_parquet(parquet_path, compression='snappy', index=False)
+    except Exception as e:
+        app.logger.warning(f"Could not write normalized.parquet for {job_dir.name}, readers fall back to the CSV: {e}")
+        try:
+            parquet_path.unlink()
+        except FileNotFoundError:
+            pass
+
+# Normalized columns the dashboard metrics read (with their alternate spellings)
+_METRICS_COLUMNS = (
+    'CLEANED_SHIPPING_SERVICE', 'Shipping Service', 'Shipping Carrier',
+    'WEIGHT_IN_OZ', 'Weight', 'WEIGHT_IN_LBS', 'Zone', 'ZONE', 'Label Cost', 'LABEL_COST'
+)
+
+def _read_normalized_frame(job_dir, columns=None):
+    """Load the normalized frame, optionally only the given columns (missing ones are skipped)."""
+    if columns is None:
+        return _load_normalized_frame(job_dir)
+    job_dir = Path(job_dir)
+    source = job_dir / 'normalized.parquet'
+    if not source.exists():
+        source = job_dir / 'normalized.csv'
+    try:
+        signature = _stat_signature(source)
+    except FileNotFoundError:
+        return _load_normalized_frame(job_dir, columns)
+    # Metrics, carrier details and the batch pass all read the same subset back-to-back
+    cache_key = (str(source), tuple(columns))
+    if signature is not None:
+        with _normalized_frame_cache_lock:
+            cached = _normalized_frame_cache.get(cache_key)
+            if cached and cached['signature'] == signature:
+                return cached['frame'].copy(deep=False)
+    frame = _load_normalized_frame(job_dir, columns)
+    with _normalized_frame_cache_lock:
+        _normalized_frame_cache.pop(cache_key, None)
+        if signature is None:
+            return frame
+        _normalized_frame_cache[cache_key] = {'frame': frame, 'signature': signature}
+        while len(_normalized_frame_cache) > _NORMALIZED_FRAME_CACHE_SIZE:
+            _normalized_frame_cache.pop(next(iter(_normalized_frame_cache)))
+    return frame.copy(deep=False)
+
+def _load_normalized_frame(job_dir, columns=None):
+    job_dir = Path(job_dir)
+    parquet_path = job_dir / 'normalized.parquet'
+    if parquet_path.exists():
+        try:
+            if columns is None:
+                return pd.read_parquet(parquet_path)
+            import pyarrow.parquet as pq
+            available = set(pq.read_schema(parquet_path).names)
+            return pd.read_parquet(parquet_path, columns=[c for c in columns if c in available])
+        except Exception:
+            pass
+    if columns is None:
+        return pd.read_csv(job_dir / 'normalized.csv')
+    wanted = set(columns)
+    return pd.read_csv(job_dir / 'normalized.csv', usecols=lambda c: c in wanted)
+
+def _normalized_isin(series, normalize, allowed):
+    """series.fillna('').astype(str).apply(normalize).isin(allowed), decided once per distinct value."""
+    text = series.fillna("").astype(str)
+    codes, uniques = pd.factorize(text)
+    hits = np.array([normalize(value) in allowed for value in uniques], dtype=bool)
+    return pd.Series(hits[codes], index=text.index)
+
+def _metric_zones(zone_series):
+    """Zones as plain int8 for grouping; anything that is not a whole zone 1-8 becomes -1."""
+    zones = pd.to_numeric(zone_series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = (zones >= 1) & (zones <= 8) & (np.floor(zones) == zones)
+    return np.where(valid, zones, -1).astype(np.int8)
+
+def _zone_bucket_counts(work_df):
+    """(count_all, count_qualified, avg qualified label cost) from a single grouped pass."""
+    grouped = work_df.assign(
+        qualified_cost=work_df['label_cost'].where(work_df['qualified'])
+    ).groupby(['zone', 'weight_bucket'], observed=True)
+    counts = grouped.agg(
+        count_all=('qualified', 'size'),
+        count_qualified=('qualified', 'sum'),
+        cost_sum=('qualified_cost', 'sum'),
+        cost_count=('qualified_cost', 'count')
+    )
+    cost_count = int(counts['cost_count'].sum())
+    avg_cost = float(counts['cost_sum'].sum() / cost_count) if cost_count else 0.0
+    # Groups with no qualified rows keep a 0 count; callers skip counts <= 0
+    return counts['count_all'], counts['count_qualified'].astype('int64'), avg_cost
+
+def _mode_or_min_by_zone_bucket(frame):
+    """Most common label_cost per (zone, weight_bucket); ties (and all-unique groups) take the lowest."""
+    keys = ['zone', 'weight_bucket']
+    counts = frame.groupby(keys + ['label_cost'], observed=True).size()
     if counts.empty:
-        return None
-    max_count = counts.max()
-    if max_count <= 1:
-        return float(series.min())
-    candidates = counts[counts == max_count].index
-    return float(min(candidates))
+        return pd.Series(dtype=float)
+    counts = counts.reset_index(name='_count').sort_values(
+        keys + ['_count', 'label_cost'], ascending=[True, True, False, True], kind='mergesort'
+    )
+    return counts.drop_duplicates(keys).set_index(keys)['label_cost'].astype(float)
 
 def _calculate_all_carriers_batch(job_dir, all_carriers, mapping_config):
     """Calculate metrics for all carriers in a single pass - much faster than per-carrier calls."""
     normalized_csv = Path(job_dir) / 'normalized.csv'
     if not normalized_csv.exists():
         return {}, {}
-    normalized_df = pd.read_csv(normalized_csv)
+    normalized_df = _read_normalized_frame(job_dir, columns=_METRICS_COLUMNS)
     if normalized_df.empty:
         return {}, {}
 
@@ -1996,7 +2345,7 @@ def _calculate_all_carriers_batch(job_dir, all_carriers, mapping_config):
     pricing_file = Path(job_dir) / 'merchant_pricing.json'
     if pricing_file.exists():
         with open(pricing_file, 'r') as f:
-            merchant_pricing = json.load(f)
+            merchant_pricing = _json_load(f)
     excluded_carriers = merchant_pricing.get('excluded_carriers', [])
     included_services = merchant_pricing.get('included_services', [])
     if not included_services:
@@ -2015,10 +2364,8 @@ def _calculate_all_carriers_batch(job_dir, all_carriers, mapping_config):
     if carrier_series is None:
         carrier_series = pd.Series([""] * len(normalized_df))
 
-    service_norm = service_series.fillna("").astype(str).apply(normalize_service_name)
-    carrier_norm = carrier_series.fillna("").astype(str).apply(normalize_merchant_carrier)
-    carrier_allowed = ~carrier_norm.isin(normalized_excluded)
-    qualified = service_norm.isin(normalized_selected) & carrier_allowed
+    carrier_allowed = ~_normalized_isin(carrier_series, normalize_merchant_carrier, normalized_excluded)
+    qualified = _normalized_isin(service_series, normalize_service_name, normalized_selected) & carrier_allowed
 
     weight_oz = normalized_df.get('WEIGHT_IN_OZ')
     if weight_oz is None:
@@ -2029,13 +2376,13 @@ def _calculate_all_carriers_batch(job_dir, all_carriers, mapping_config):
     if weight_lbs is None:
         weight_lbs = pd.Series([np.nan] * len(normalized_df))
 
-    weight_bucket = _compute_first_mile_weight(weight_oz, weight_lbs)
+    weight_bucket = _weight_bucket_categorical(_compute_first_mile_weight(weight_oz, weight_lbs))
     zone_series = normalized_df.get('Zone')
     if zone_series is None:
         zone_series = normalized_df.get('ZONE')
     if zone_series is None:
         zone_series = pd.Series([np.nan] * len(normalized_df))
-    zone = pd.to_numeric(zone_series, errors='coerce').astype('Int64')
+    zone = _metric_zones(zone_series)
 
     label_cost = normalized_df.get('Label Cost')
     if label_cost is None:
@@ -2050,21 +2397,21 @@ def _calculate_all_carriers_batch(job_dir, all_carriers, mapping_config):
         'label_cost': label_cost,
         'qualified': qualified
     })
-    work_df = work_df[work_df['zone'].between(1, 8)]
-    work_df = work_df[work_df['weight_bucket'].isin(WEIGHT_BUCKETS)]
+    # Zones 1-8 on the bucket grid, filtered with one combined mask (one copy)
+    in_grid = (work_df['zone'] > 0) & (work_df['weight_bucket'].cat.codes >= 0)
+    work_df = work_df[in_grid]
     if work_df.empty:
         return {}, {}
 
-    count_all = work_df.groupby(['zone', 'weight_bucket']).size()
+    count_all, count_qualified, avg_qualified_label_cost = _zone_bucket_counts(work_df)
     qualified_df = work_df[work_df['qualified']]
-    count_qualified = qualified_df.groupby(['zone', 'weight_bucket']).size()
 
     merchant_rate = None
     if controls['k2'] == 'USPS Market Rates':
         merchant_rate = {}
         usps_rates = rate_tables.get('USPS Market', {})
         for (zone_val, weight_val), count_val in count_all.items():
-            row_idx = _rate_row_for_bucket(weight_val)
+            row_idx = BUCKET_TO_ROW.get(weight_val)
             rate = None
             if row_idx and row_idx in usps_rates:
                 rate = usps_rates[row_idx].get(int(zone_val))
@@ -2073,14 +2420,11 @@ def _calculate_all_carriers_batch(job_dir, all_carriers, mapping_config):
     else:
         if controls['g2'] == 'Minimum Rates':
             nonzero = qualified_df[qualified_df['label_cost'] > 0]
-            merchant_rate = nonzero.groupby(['zone', 'weight_bucket'])['label_cost'].min()
+            merchant_rate = nonzero.groupby(['zone', 'weight_bucket'], observed=True)['label_cost'].min()
         else:
-            merchant_rate = qualified_df.groupby(['zone', 'weight_bucket'])['label_cost'].apply(_mode_or_min)
+            merchant_rate = _mode_or_min_by_zone_bucket(qualified_df)
 
-    total_qualified = 0
-    for key, count_val in count_qualified.items():
-        if count_val > 0:
-            total_qualified += count_val
+    total_qualified = int(count_qualified.sum())
     if total_qualified <= 0:
         return {}, {}
 
@@ -2098,18 +2442,30 @@ def _calculate_all_carriers_batch(job_dir, all_carriers, mapping_config):
     c20 = float(controls['c20'] or 0)
     usps_rates = rate_tables.get('USPS Market', {})
 
-    avg_qualified_label_cost = (
-        float(qualified_df['label_cost'].mean())
-        if not qualified_df.empty and qualified_df['label_cost'].notna().any()
-        else 0.0
-    )
     annual_orders_value = annual_orders or orders_in_analysis
 
+    # Resolve everything that does not depend on the carrier once per (zone, weight) group,
+    # so the per-carrier pass below is a single rate lookup per group
+    group_rows = []
+    for (zone_val, weight_val), count_val in count_all.items():
+        count_q = count_qualified.get((zone_val, weight_val), 0)
+        if count_q <= 0:
+            continue
+        merchant = merchant_rate.get((zone_val, weight_val))
+        if merchant is None or (isinstance(merchant, float) and math.isnan(merchant)):
+            continue
+        row_idx = BUCKET_TO_ROW.get(weight_val)
+        if not row_idx:
+            continue
+        zone_int = int(zone_val)
+        usps_market_rate = usps_rates.get(row_idx, {}).get(zone_int)
+        group_rows.append((count_val, merchant, row_idx, zone_int, usps_market_rate))
+
     carrier_metrics = {}
     for carrier in all_carriers:
         if carrier not in rate_tables:
             continue
-        selected_carriers = [carrier]
+        carrier_rates = rate_tables[carrier]
         savings_all = 0.0
         savings_won = 0.0
         spread_all = 0.0
@@ -2119,28 +2475,12 @@ def _calculate_all_carriers_batch(job_dir, all_carriers, mapping_config):
         usps_won_count = 0.0
         ups_won_count = 0.0
 
-        for (zone_val, weight_val), count_val in count_all.items():
-            count_q = count_qualified.get((zone_val, weight_val), 0)
-            if count_q <= 0:
-                continue
-            merchant = merchant_rate.get((zone_val, weight_val))
-            if merchant is None or (isinstance(merchant, float) and math.isnan(merchant)):
+        for count_val, merchant, row_idx, zone_int, usps_market_rate in group_rows:
+            redo_rate = carrier_rates.get(row_idx, {}).get(zone_int)
+            if redo_rate is None:
                 continue
-            row_idx = _rate_row_for_bucket(weight_val)
-            if not row_idx:
-                continue
-            redo_rates = {}
-            for c in selected_carriers:
-                rate = rate_tables.get(c, {}).get(row_idx, {}).get(int(zone_val))
-                if rate is not None:
-                    redo_rates[c] = rate
-            if not redo_rates:
-                continue
-            min_rate = min(redo_rates.values())
             winning_carrier = carrier
 
-            redo_rate = min_rate
-            usps_market_rate = usps_rates.get(row_idx, {}).get(int(zone_val)) if row_idx else None
             if winning_carrier in {'USPS Market', 'UPS Ground', 'UPS Ground Saver'}:
                 rate_offered = redo_rate
             else:
@@ -2236,6 +2576,7 @@ def _calculate_summary_from_context(selected_dashboard, context):
     selected_carriers = [c for c in selected_dashboard if c in rate_tables]
     if not selected_carriers:
         return {}
+    carrier_tables = _priority_carrier_tables(selected_carriers, rate_tables)
 
     savings_all = 0.0
     savings_won = 0.0
@@ -2253,25 +2594,12 @@ def _calculate_summary_from_context(selected_dashboard, context):
         merchant = merchant_rate.get((zone_val, weight_val))
         if merchant is None or (isinstance(merchant, float) and math.isnan(merchant)):
             continue
-        row_idx = _rate_row_for_bucket(weight_val)
+        row_idx = BUCKET_TO_ROW.get(weight_val)
         if not row_idx:
             continue
-        redo_rates = {}
-        for carrier in selected_carriers:
-            rate = rate_tables.get(carrier, {}).get(row_idx, {}).get(int(zone_val))
-            if rate is not None:
-                redo_rates[carrier] = rate
-        if not redo_rates:
-            continue
-        min_rate = min(redo_rates.values())
-        winning_carrier = None
-        for carrier in CARRIER_PRIORITY:
-            rate = redo_rates.get(carrier)
-            if rate is not None and abs(rate - min_rate) < 1e-9:
-                winning_carrier = carrier
-                break
+        winning_carrier, min_rate = _redo_winner(carrier_tables, row_idx, int(zone_val))
         if winning_carrier is None:
-            winning_carrier = min(redo_rates, key=redo_rates.get)
+            continue
 
         redo_rate = min_rate
         usps_market_rate = usps_rates.get(row_idx, {}).get(int(zone_val)) if row_idx else None
@@ -2334,28 +2662,118 @@ def _calculate_summary_from_context(selected_dashboard, context):
         'Average Label Cost': avg_qualified_label_cost
     }
 
-def _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config):
-    normalized_csv = job_dir / 'normalized.csv'
-    if not normalized_csv.exists():
-        return {}
-    normalized_df = pd.read_csv(normalized_csv)
-    if normalized_df.empty:
-        return {}
+def _fast_inputs_source(job_dir, template_path):
+    """Stat signatures of the files the metrics inputs derive from; None while any is too fresh to trust."""
+    source = []
+    for path in (job_dir / 'normalized.parquet', job_dir / 'normalized.csv',
+                 job_dir / 'merchant_pricing.json', template_path):
+        try:
+            signature = _stat_signature(path)
+        except FileNotFoundError:
+            source.append(None)
+            continue
+        if signature is None:
+            return None
+        # Lists, so the signature compares equal after a JSON round-trip
+        source.append(list(signature))
+    return source
+
+def _fast_inputs_file(job_dir):
+    return Path(job_dir) / 'metrics_inputs.json'
 
+def _read_fast_inputs_file(job_dir, source):
+    """Group-level inputs persisted by another worker for the same source files, else None."""
+    cache_path = _fast_inputs_file(job_dir)
+    if not cache_path.exists():
+        return None
+    try:
+        cache = _json_loads(cache_path.read_bytes())
+    except Exception:
+        return None
+    if cache.get('source') != source:
+        return None
+    return cache
+
+def _write_fast_inputs_file(job_dir, cache):
+    """Atomically replace metrics_inputs.json so other workers never read a partial file."""
+    cache_path = _fast_inputs_file(job_dir)
+    with tempfile.NamedTemporaryFile('wb', delete=False, dir=cache_path.parent, suffix='.tmp') as tmp:
+        tmp.write(_json_dumps_bytes(cache))
+    os.replace(tmp.name, cache_path)
+
+def _prepare_fast_inputs(job_dir, mapping_config):
+    """Selection-independent inputs shared by _calculate_metrics_fast and _calculate_carrier_details_fast.
+
+    Returns None when the job has no qualified orders to price. The per-group counts and
+    merchant rates are reused (in memory, then from metrics_inputs.json) while the normalized
+    frame, merchant pricing, template and USPS market discounts are unchanged.
+    """
+    job_dir = Path(job_dir)
     template_path = Path('#New Template - Rate Card.xlsx')
     if not template_path.exists():
         template_path = Path('Rate Card Template.xlsx')
+    pct_off, dollar_off = _usps_market_discount_values(mapping_config)
+    cache_key = (str(job_dir), pct_off, dollar_off)
+    # None while a source file was just written: rebuild without reading or storing either cache
+    source = _fast_inputs_source(job_dir, template_path)
+    if source is not None:
+        source += [pct_off, dollar_off]
+        with _fast_inputs_cache_lock:
+            cached = _fast_inputs_cache.get(cache_key)
+            if cached and cached['source'] == source:
+                return cached['inputs']
+
     rate_tables = _load_rate_tables(str(template_path))
     controls = dict(_get_pricing_controls(str(template_path)))
-    pct_off, dollar_off = _usps_market_discount_values(mapping_config)
     controls['c19'] = pct_off
     controls['c20'] = dollar_off
+    cache = _read_fast_inputs_file(job_dir, source) if source is not None else None
+    if cache is None:
+        cache = {'source': source, 'groups': _build_fast_groups(job_dir, rate_tables, controls)}
+        if source is not None:
+            try:
+                _write_fast_inputs_file(job_dir, cache)
+            except Exception as exc:
+                app.logger.warning(f"Could not write metrics inputs cache: {exc}")
+
+    groups = cache['groups']
+    inputs = None
+    if groups is not None:
+        rows = groups['rows']
+        inputs = {
+            'rate_tables': rate_tables,
+            'controls': controls,
+            'count_all': {(zone, bucket): count for zone, bucket, count, _, _ in rows},
+            'count_qualified': {(zone, bucket): count_q for zone, bucket, _, count_q, _ in rows},
+            'merchant_rate': {(zone, bucket): merchant for zone, bucket, _, _, merchant in rows},
+            'total_qualified': groups['total_qualified'],
+            'avg_qualified_label_cost': groups['avg_qualified_label_cost'],
+            'scans': {}
+        }
+    with _fast_inputs_cache_lock:
+        _fast_inputs_cache.pop(cache_key, None)
+        if source is None:
+            return inputs
+        _fast_inputs_cache[cache_key] = {'inputs': inputs, 'source': source}
+        while len(_fast_inputs_cache) > _NORMALIZED_FRAME_CACHE_SIZE:
+            _fast_inputs_cache.pop(next(iter(_fast_inputs_cache)))
+    return inputs
+
+def _build_fast_groups(job_dir, rate_tables, controls):
+    """Per (zone, bucket) counts and merchant rates as JSON-ready rows; None when nothing qualifies."""
+    job_dir = Path(job_dir)
+    normalized_csv = job_dir / 'normalized.csv'
+    if not normalized_csv.exists():
+        return None
+    normalized_df = _read_normalized_frame(job_dir, columns=_METRICS_COLUMNS)
+    if normalized_df.empty:
+        return None
 
     merchant_pricing = {'excluded_carriers': [], 'included_services': []}
     pricing_file = job_dir / 'merchant_pricing.json'
     if pricing_file.exists():
         with open(pricing_file, 'r') as f:
-            merchant_pricing = json.load(f)
+            merchant_pricing = _json_load(f)
     excluded_carriers = merchant_pricing.get('excluded_carriers', [])
     included_services = merchant_pricing.get('included_services', [])
     if not included_services:
@@ -2374,10 +2792,8 @@ def _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config):
     if carrier_series is None:
         carrier_series = pd.Series([""] * len(normalized_df))
 
-    service_norm = service_series.fillna("").astype(str).apply(normalize_service_name)
-    carrier_norm = carrier_series.fillna("").astype(str).apply(normalize_merchant_carrier)
-    carrier_allowed = ~carrier_norm.isin(normalized_excluded)
-    qualified = service_norm.isin(normalized_selected) & carrier_allowed
+    carrier_allowed = ~_normalized_isin(carrier_series, normalize_merchant_carrier, normalized_excluded)
+    qualified = _normalized_isin(service_series, normalize_service_name, normalized_selected) & carrier_allowed
 
     weight_oz = normalized_df.get('WEIGHT_IN_OZ')
     if weight_oz is None:
@@ -2388,13 +2804,13 @@ def _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config):
     if weight_lbs is None:
         weight_lbs = pd.Series([np.nan] * len(normalized_df))
 
-    weight_bucket = _compute_first_mile_weight(weight_oz, weight_lbs)
+    weight_bucket = _weight_bucket_categorical(_compute_first_mile_weight(weight_oz, weight_lbs))
     zone_series = normalized_df.get('Zone')
     if zone_series is None:
         zone_series = normalized_df.get('ZONE')
     if zone_series is None:
         zone_series = pd.Series([np.nan] * len(normalized_df))
-    zone = pd.to_numeric(zone_series, errors='coerce').astype('Int64')
+    zone = _metric_zones(zone_series)
 
     label_cost = normalized_df.get('Label Cost')
     if label_cost is None:
@@ -2409,21 +2825,21 @@ def _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config):
         'label_cost': label_cost,
         'qualified': qualified
     })
-    work_df = work_df[work_df['zone'].between(1, 8)]
-    work_df = work_df[work_df['weight_bucket'].isin(WEIGHT_BUCKETS)]
+    # Zones 1-8 on the bucket grid, filtered with one combined mask (one copy)
+    in_grid = (work_df['zone'] > 0) & (work_df['weight_bucket'].cat.codes >= 0)
+    work_df = work_df[in_grid]
     if work_df.empty:
-        return {}
+        return None
 
-    count_all = work_df.groupby(['zone', 'weight_bucket']).size()
+    count_all, count_qualified, avg_qualified_label_cost = _zone_bucket_counts(work_df)
     qualified_df = work_df[work_df['qualified']]
-    count_qualified = qualified_df.groupby(['zone', 'weight_bucket']).size()
 
     merchant_rate = None
     if controls['k2'] == 'USPS Market Rates':
         merchant_rate = {}
         usps_rates = rate_tables.get('USPS Market', {})
         for (zone_val, weight_val), count_val in count_all.items():
-            row_idx = _rate_row_for_bucket(weight_val)
+            row_idx = BUCKET_TO_ROW.get(weight_val)
             rate = None
             if row_idx and row_idx in usps_rates:
                 rate = usps_rates[row_idx].get(int(zone_val))
@@ -2432,34 +2848,55 @@ def _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config):
     else:
         if controls['g2'] == 'Minimum Rates':
             nonzero = qualified_df[qualified_df['label_cost'] > 0]
-            merchant_rate = nonzero.groupby(['zone', 'weight_bucket'])['label_cost'].min()
+            merchant_rate = nonzero.groupby(['zone', 'weight_bucket'], observed=True)['label_cost'].min()
         else:
-            merchant_rate = qualified_df.groupby(['zone', 'weight_bucket'])['label_cost'].apply(_mode_or_min)
+            merchant_rate = _mode_or_min_by_zone_bucket(qualified_df)
 
-    total_qualified = 0
-    for key, count_val in count_qualified.items():
-        if count_val > 0:
-            total_qualified += count_val
+    total_qualified = int(count_qualified.sum())
     if total_qualified <= 0:
-        return {}
+        return None
 
-    selected_carriers = [c for c in selected_dashboard if c in rate_tables]
-    if not selected_carriers:
-        return {}
+    rows = []
+    for (zone_val, weight_val), count_val in count_all.items():
+        merchant = merchant_rate.get((zone_val, weight_val))
+        if merchant is not None and math.isnan(merchant):
+            merchant = None
+        rows.append([
+            int(zone_val), float(weight_val), int(count_val),
+            int(count_qualified.get((zone_val, weight_val), 0)),
+            None if merchant is None else float(merchant)
+        ])
+    return {
+        'rows': rows,
+        'total_qualified': total_qualified,
+        'avg_qualified_label_cost': avg_qualified_label_cost
+    }
 
-    savings_all = 0.0
-    savings_won = 0.0
-    spread_all = 0.0
-    spread_won = 0.0
-    winable_count = 0.0
-    won_count = 0.0
-    usps_won_count = 0.0
-    ups_won_count = 0.0
+def _scan_fast_groups(inputs, selected_dashboard):
+    """Winning carrier and offered rate per priced (zone, bucket) group for one selection.
 
+    Shared by _calculate_metrics_fast and _calculate_carrier_details_fast; the result is kept
+    on the cached inputs so the second caller for the same selection skips the group loop.
+    """
+    rate_tables = inputs['rate_tables']
+    selected_carriers = tuple(c for c in (selected_dashboard or []) if c in rate_tables)
+    if not selected_carriers:
+        return None
+    scans = inputs['scans']
+    groups = scans.get(selected_carriers)
+    if groups is not None:
+        return groups
+
+    controls = inputs['controls']
+    count_all = inputs['count_all']
+    count_qualified = inputs['count_qualified']
+    merchant_rate = inputs['merchant_rate']
     c19 = float(controls['c19'] or 0)
     c20 = float(controls['c20'] or 0)
     usps_rates = rate_tables.get('USPS Market', {})
+    carrier_tables = _priority_carrier_tables(selected_carriers, rate_tables)
 
+    groups = []
     for (zone_val, weight_val), count_val in count_all.items():
         count_q = count_qualified.get((zone_val, weight_val), 0)
         if count_q <= 0:
@@ -2467,25 +2904,12 @@ def _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config):
         merchant = merchant_rate.get((zone_val, weight_val))
         if merchant is None or (isinstance(merchant, float) and math.isnan(merchant)):
             continue
-        row_idx = _rate_row_for_bucket(weight_val)
+        row_idx = BUCKET_TO_ROW.get(weight_val)
         if not row_idx:
             continue
-        redo_rates = {}
-        for carrier in selected_carriers:
-            rate = rate_tables.get(carrier, {}).get(row_idx, {}).get(int(zone_val))
-            if rate is not None:
-                redo_rates[carrier] = rate
-        if not redo_rates:
-            continue
-        min_rate = min(redo_rates.values())
-        winning_carrier = None
-        for carrier in CARRIER_PRIORITY:
-            rate = redo_rates.get(carrier)
-            if rate is not None and abs(rate - min_rate) < 1e-9:
-                winning_carrier = carrier
-                break
+        winning_carrier, min_rate = _redo_winner(carrier_tables, row_idx, int(zone_val))
         if winning_carrier is None:
-            winning_carrier = min(redo_rates, key=redo_rates.get)
+            continue
 
         redo_rate = min_rate
         usps_market_rate = None
@@ -2504,6 +2928,30 @@ def _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config):
             else:
                 rate_offered = max(redo_rate, base_rate - c20)
 
+        groups.append((count_val, count_q, winning_carrier, merchant, redo_rate, rate_offered))
+    scans[selected_carriers] = groups
+    return groups
+
+def _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config):
+    inputs = _prepare_fast_inputs(job_dir, mapping_config)
+    if inputs is None:
+        return {}
+    groups = _scan_fast_groups(inputs, selected_dashboard)
+    if groups is None:
+        return {}
+    controls = inputs['controls']
+    total_qualified = inputs['total_qualified']
+
+    savings_all = 0.0
+    savings_won = 0.0
+    spread_all = 0.0
+    spread_won = 0.0
+    winable_count = 0.0
+    won_count = 0.0
+    usps_won_count = 0.0
+    ups_won_count = 0.0
+
+    for count_val, count_q, winning_carrier, merchant, redo_rate, rate_offered in groups:
         savings = merchant - rate_offered
         base_savings = merchant - redo_rate
         spread = rate_offered - redo_rate
@@ -2541,11 +2989,7 @@ def _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config):
     annual_orders_value = annual_orders or orders_in_analysis
     usps_won_pct = usps_won_count / total_qualified if total_qualified else 0
     ups_won_pct = ups_won_count / total_qualified if total_qualified else 0
-    avg_qualified_label_cost = (
-        float(qualified_df['label_cost'].mean())
-        if not qualified_df.empty and qualified_df['label_cost'].notna().any()
-        else 0.0
-    )
+    avg_qualified_label_cost = inputs['avg_qualified_label_cost']
     selected_set = set(selected_dashboard or [])
     if selected_set and selected_set.issubset({'USPS Market'}):
         est_redo_deal = 0.20 * annual_orders_value * usps_won_pct
@@ -2565,169 +3009,18 @@ def _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config):
     }
 
 def _calculate_carrier_details_fast(job_dir, selected_dashboard, mapping_config):
-    normalized_csv = Path(job_dir) / 'normalized.csv'
-    if not normalized_csv.exists():
-        return {}
-    normalized_df = pd.read_csv(normalized_csv)
-    if normalized_df.empty:
-        return {}
-
-    template_path = Path('#New Template - Rate Card.xlsx')
-    if not template_path.exists():
-        template_path = Path('Rate Card Template.xlsx')
-    rate_tables = _load_rate_tables(str(template_path))
-    controls = dict(_get_pricing_controls(str(template_path)))
-    pct_off, dollar_off = _usps_market_discount_values(mapping_config)
-    controls['c19'] = pct_off
-    controls['c20'] = dollar_off
-
-    merchant_pricing = {'excluded_carriers': [], 'included_services': []}
-    pricing_file = Path(job_dir) / 'merchant_pricing.json'
-    if pricing_file.exists():
-        with open(pricing_file, 'r') as f:
-            merchant_pricing = json.load(f)
-    excluded_carriers = merchant_pricing.get('excluded_carriers', [])
-    included_services = merchant_pricing.get('included_services', [])
-    if not included_services:
-        available_services = _unique_cleaned_services(normalized_df)
-        included_services = default_included_services(available_services)
-
-    normalized_selected = {normalize_service_name(s) for s in included_services}
-    normalized_excluded = {normalize_merchant_carrier(c) for c in excluded_carriers}
-
-    service_series = normalized_df.get('CLEANED_SHIPPING_SERVICE')
-    if service_series is None:
-        service_series = normalized_df.get('Shipping Service')
-    carrier_series = normalized_df.get('Shipping Carrier')
-    if service_series is None:
-        service_series = pd.Series([""] * len(normalized_df))
-    if carrier_series is None:
-        carrier_series = pd.Series([""] * len(normalized_df))
-
-    service_norm = service_series.fillna("").astype(str).apply(normalize_service_name)
-    carrier_norm = carrier_series.fillna("").astype(str).apply(normalize_merchant_carrier)
-    carrier_allowed = ~carrier_norm.isin(normalized_excluded)
-    qualified = service_norm.isin(normalized_selected) & carrier_allowed
-
-    weight_oz = normalized_df.get('WEIGHT_IN_OZ')
-    if weight_oz is None:
-        weight_oz = normalized_df.get('Weight')
-    if weight_oz is None:
-        weight_oz = pd.Series([np.nan] * len(normalized_df))
-    weight_lbs = normalized_df.get('WEIGHT_IN_LBS')
-    if weight_lbs is None:
-        weight_lbs = pd.Series([np.nan] * len(normalized_df))
-
-    weight_bucket = _compute_first_mile_weight(weight_oz, weight_lbs)
-    zone_series = normalized_df.get('Zone')
-    if zone_series is None:
-        zone_series = normalized_df.get('ZONE')
-    if zone_series is None:
-        zone_series = pd.Series([np.nan] * len(normalized_df))
-    zone = pd.to_numeric(zone_series, errors='coerce').astype('Int64')
-
-    label_cost = normalized_df.get('Label Cost')
-    if label_cost is None:
-        label_cost = normalized_df.get('LABEL_COST')
-    if label_cost is None:
-        label_cost = pd.Series([np.nan] * len(normalized_df))
-    label_cost = pd.to_numeric(label_cost, errors='coerce')
-
-    work_df = pd.DataFrame({
-        'zone': zone,
-        'weight_bucket': weight_bucket,
-        'label_cost': label_cost,
-        'qualified': qualified
-    })
-    work_df = work_df[work_df['zone'].between(1, 8)]
-    work_df = work_df[work_df['weight_bucket'].isin(WEIGHT_BUCKETS)]
-    if work_df.empty:
-        return {}
-
-    count_all = work_df.groupby(['zone', 'weight_bucket']).size()
-    qualified_df = work_df[work_df['qualified']]
-    count_qualified = qualified_df.groupby(['zone', 'weight_bucket']).size()
-
-    merchant_rate = None
-    if controls['k2'] == 'USPS Market Rates':
-        merchant_rate = {}
-        usps_rates = rate_tables.get('USPS Market', {})
-        for (zone_val, weight_val), count_val in count_all.items():
-            row_idx = _rate_row_for_bucket(weight_val)
-            rate = None
-            if row_idx and row_idx in usps_rates:
-                rate = usps_rates[row_idx].get(int(zone_val))
-            if rate is not None:
-                merchant_rate[(zone_val, weight_val)] = rate
-    else:
-        if controls['g2'] == 'Minimum Rates':
-            nonzero = qualified_df[qualified_df['label_cost'] > 0]
-            merchant_rate = nonzero.groupby(['zone', 'weight_bucket'])['label_cost'].min()
-        else:
-            merchant_rate = qualified_df.groupby(['zone', 'weight_bucket'])['label_cost'].apply(_mode_or_min)
-
-    total_qualified = 0
-    for key, count_val in count_qualified.items():
-        if count_val > 0:
-            total_qualified += count_val
-    if total_qualified <= 0:
+    inputs = _prepare_fast_inputs(job_dir, mapping_config)
+    if inputs is None:
         return {}
-
-    selected_carriers = [c for c in (selected_dashboard or []) if c in rate_tables]
-    if not selected_carriers:
+    groups = _scan_fast_groups(inputs, selected_dashboard)
+    if groups is None:
         return {}
+    total_qualified = inputs['total_qualified']
 
     won_counts = {carrier: 0.0 for carrier in DASHBOARD_CARRIERS}
     spread_sums = {carrier: 0.0 for carrier in DASHBOARD_CARRIERS}
 
-    c19 = float(controls['c19'] or 0)
-    c20 = float(controls['c20'] or 0)
-    usps_rates = rate_tables.get('USPS Market', {})
-
-    for (zone_val, weight_val), count_val in count_all.items():
-        count_q = count_qualified.get((zone_val, weight_val), 0)
-        if count_q <= 0:
-            continue
-        merchant = merchant_rate.get((zone_val, weight_val))
-        if merchant is None or (isinstance(merchant, float) and math.isnan(merchant)):
-            continue
-        row_idx = _rate_row_for_bucket(weight_val)
-        if not row_idx:
-            continue
-        redo_rates = {}
-        for carrier in selected_carriers:
-            rate = rate_tables.get(carrier, {}).get(row_idx, {}).get(int(zone_val))
-            if rate is not None:
-                redo_rates[carrier] = rate
-        if not redo_rates:
-            continue
-        min_rate = min(redo_rates.values())
-        winning_carrier = None
-        for carrier in CARRIER_PRIORITY:
-            rate = redo_rates.get(carrier)
-            if rate is not None and abs(rate - min_rate) < 1e-9:
-                winning_carrier = carrier
-                break
-        if winning_carrier is None:
-            winning_carrier = min(redo_rates, key=redo_rates.get)
-
-        redo_rate = min_rate
-        usps_market_rate = None
-        if row_idx and row_idx in usps_rates:
-            usps_market_rate = usps_rates[row_idx].get(int(zone_val))
-        if winning_carrier in {'USPS Market', 'UPS Ground', 'UPS Ground Saver'}:
-            rate_offered = redo_rate
-        else:
-            base_rate = merchant
-            if winning_carrier in {'UniUni', 'Amazon'} and usps_market_rate is not None:
-                base_rate = usps_market_rate
-            if base_rate is None or (isinstance(base_rate, float) and math.isnan(base_rate)):
-                continue
-            if c19 > 0:
-                rate_offered = max(redo_rate, base_rate * (1 - c19))
-            else:
-                rate_offered = max(redo_rate, base_rate - c20)
-
+    for count_val, count_q, winning_carrier, merchant, redo_rate, rate_offered in groups:
         spread = rate_offered - redo_rate
         won_counts[winning_carrier] += count_q
         spread_sums[winning_carrier] += spread * count_q
@@ -2747,18 +3040,13 @@ def _calculate_carrier_details_fast(job_dir, selected_dashboard, mapping_config)
     return details
 
 def _calculate_metrics(job_dir, selected_dashboard, profile_dir=None):
-    mapping_file = job_dir / 'mapping.json'
-    mapping_config = {}
-    if mapping_file.exists():
-        with open(mapping_file, 'r') as f:
-            mapping_config = json.load(f)
-    rate_card_files = list(job_dir.glob('* - Rate Card.xlsx'))
+    rate_card_files = [f for f in _rate_card_files(job_dir) if f.name.endswith(' - Rate Card.xlsx')]
     if not rate_card_files:
         raise FileNotFoundError('Rate card not found')
     return _calculate_metrics_from_formulas(rate_card_files[0], selected_dashboard)
 
 def _calculate_metrics_batch(job_dir, selections, profile_dir=None):
-    rate_card_files = list(job_dir.glob('* - Rate Card.xlsx'))
+    rate_card_files = [f for f in _rate_card_files(job_dir) if f.name.endswith(' - Rate Card.xlsx')]
     if not rate_card_files:
         return {}
     source_path = rate_card_files[0]
@@ -2825,7 +3113,7 @@ def _read_dashboard_cache(job_dir):
         if breakdown_path.exists():
             try:
                 with open(breakdown_path, 'r') as f:
-                    data = json.load(f)
+                    data = _json_load(f)
                     result['breakdown'] = data.get('carriers', {})
                     result['source_hash'] = data.get('source_hash')
                     result['ready'] = True
@@ -2836,7 +3124,7 @@ def _read_dashboard_cache(job_dir):
         if summary_path.exists():
             try:
                 with open(summary_path, 'r') as f:
-                    result['summary'] = json.load(f)
+                    result['summary'] = _json_load(f)
             except json.JSONDecodeError as e:
                 app.logger.error(f"Failed to parse summary cache: {e}")
             except Exception as e:
@@ -3143,14 +3431,7 @@ def _read_metrics_from_excel_cells(rate_card_path):
         if 'Pricing & Summary' not in wb.sheetnames:
             wb.close()
             return {}
-        ws = wb['Pricing & Summary']
-        metrics = {
-            'Est. Merchant Annual Savings': ws['C5'].value,
-            'Est. Redo Deal Size': ws['C6'].value,
-            'Spread Available': ws['C7'].value,
-            '% Orders We Could Win': ws['C11'].value,
-            '% Orders Won W/ Spread': ws['C12'].value
-        }
+        metrics = _read_summary_metrics(wb['Pricing & Summary'])
         wb.close()
         return {k: v for k, v in metrics.items() if v is not None}
     except Exception as e:
@@ -3193,8 +3474,9 @@ def _precompute_dashboard_metrics(job_dir, mapping_config, redo_config, timeout=
     app.logger.info("Using fast batch Python calculations for dashboard metrics")
     
     carrier_metrics, context = _calculate_all_carriers_batch(job_dir, available_carriers, mapping_config)
-    for carrier, metrics in carrier_metrics.items():
-        app.logger.info(f"  {carrier}: Spread={metrics.get('Spread Available')}")
+    if app.logger.isEnabledFor(logging.INFO):
+        spreads = ', '.join(f"{carrier}={metrics.get('Spread Available')}" for carrier, metrics in carrier_metrics.items())
+        app.logger.info(f"  Spread Available: {spreads}")
     
     # Summary metrics using pre-loaded context (instant)
     summary_metrics = _calculate_summary_from_context(list(selected_dashboard), context)
@@ -3216,8 +3498,7 @@ def _read_summary_cache(job_dir, source_mtime, selection_key):
     if not cache_path.exists():
         return None
     try:
-        with open(cache_path, 'r') as f:
-            cache = json.load(f)
+        cache = _load_job_json(cache_path)
         if cache.get('source_mtime') != source_mtime:
             return None
         entries = cache.get('entries', {})
@@ -3230,8 +3511,7 @@ def _write_summary_cache(job_dir, source_mtime, selection_key, metrics):
     payload = {'source_mtime': source_mtime, 'updated_at': datetime.now(timezone.utc).isoformat(), 'entries': {}}
     if cache_path.exists():
         try:
-            with open(cache_path, 'r') as f:
-                existing = json.load(f)
+            existing = _load_job_json(cache_path)
             if existing.get('source_mtime') == source_mtime:
                 payload = existing
         except Exception:
@@ -3248,8 +3528,7 @@ def _read_breakdown_cache(job_dir, source_mtime):
     if not cache_path.exists():
         return None, False
     try:
-        with open(cache_path, 'r') as f:
-            cache = json.load(f)
+        cache = _load_job_json(cache_path)
         if cache.get('source_mtime') != source_mtime:
             return None, False
         return cache.get('per_carrier', []), bool(cache.get('complete', False))
@@ -3341,34 +3620,35 @@ def _start_summary_cache(job_dir, source_mtime, selected_dashboard):
     return None, True
 
 def _find_pricing_section(ws, section_title):
-    title_cell = None
-    # Limit search to first 200 rows - section headers should be near the top
+    # Limit search to first 200 rows - section headers should be near the top.
+    # One lazy iter_rows pass; ws[row_idx] lookups re-parse the sheet on read-only worksheets.
     max_search_rows = min(200, ws.max_row)
-    for row_idx in range(1, max_search_rows + 1):
-        for cell in ws[row_idx]:
-            if cell.value and str(cell.value).strip() == section_title:
-                title_cell = cell
+    rows = ws.iter_rows(min_row=1, max_row=max_search_rows, values_only=True)
+    header_row_idx = label_col = None
+    for row_idx, row in enumerate(rows, start=1):
+        for col_idx, value in enumerate(row, start=1):
+            if value and str(value).strip() == section_title:
+                header_row_idx, label_col = row_idx, col_idx
                 break
-        if title_cell:
+        if header_row_idx:
             break
-    if not title_cell:
+    if not header_row_idx:
         return None, None, None
 
-    header_row_idx = title_cell.row
-    label_col = title_cell.column
-    use_col = None
-
-    for cell in ws[header_row_idx]:
-        if cell.value and str(cell.value).strip() == 'Use in Pricing':
-            use_col = cell.column
-            break
+    def _use_col(values):
+        for col_idx, value in enumerate(values, start=1):
+            if value and str(value).strip() == 'Use in Pricing':
+                return col_idx
+        return None
 
+    use_col = _use_col(row)
     if use_col is None:
-        for cell in ws[header_row_idx + 1]:
-            if cell.value and str(cell.value).strip() == 'Use in Pricing':
-                use_col = cell.column
-                header_row_idx = header_row_idx + 1
-                break
+        next_row = next(rows, None)
+        if next_row is None:
+            next_row = next(ws.iter_rows(min_row=header_row_idx + 1, max_row=header_row_idx + 1, values_only=True), ())
+        use_col = _use_col(next_row)
+        if use_col is not None:
+            header_row_idx = header_row_idx + 1
 
     if use_col is None:
         return None, None, None
@@ -3376,21 +3656,17 @@ def _find_pricing_section(ws, section_title):
     return header_row_idx, label_col, use_col
 
 def _iter_section_rows(ws, start_row, label_col, stop_titles):
-    row_idx = start_row
-    max_row = ws.max_row
-    while row_idx <= max_row:
-        label_val = ws.cell(row_idx, label_col).value
+    # Stream the label column once instead of a ws.cell() lookup per row
+    labels = ws.iter_rows(min_row=start_row, min_col=label_col, max_col=label_col, values_only=True)
+    for row_idx, (label_val,) in enumerate(labels, start=start_row):
         if label_val is None:
-            row_idx += 1
             continue
         normalized = normalize_redo_label(label_val)
         if not normalized:
-            row_idx += 1
             continue
         if normalized in stop_titles:
             break
         yield row_idx, label_val
-        row_idx += 1
 
 def _scan_section_rows(ws, section_title, stop_titles):
     header_row_idx, label_col, use_col = _find_pricing_section(ws, section_title)
@@ -3455,23 +3731,26 @@ def update_pricing_summary_merchant_carriers(ws, excluded_carriers):
 def _unique_cleaned_services(normalized_df):
     if normalized_df is None or 'CLEANED_SHIPPING_SERVICE' not in normalized_df.columns:
         return []
-    seen = set()
-    ordered = []
-    for value in normalized_df['CLEANED_SHIPPING_SERVICE']:
-        if value is None or (isinstance(value, float) and pd.isna(value)):
-            continue
-        text = str(value).strip()
-        if not text:
-            continue
-        norm = normalize_service_name(text)
-        if norm not in seen:
-            seen.add(norm)
-            ordered.append(text)
-    return ordered
+    # Drop missing values with one vectorized mask and normalize each distinct text once
+    texts = normalized_df['CLEANED_SHIPPING_SERVICE'].dropna().astype(str).str.strip().unique()
+    # First text seen for each normalized name, in order of appearance
+    first_by_norm = {}
+    for text in texts:
+        if text:
+            first_by_norm.setdefault(normalize_service_name(text), text)
+    return list(first_by_norm.values())
+
+@lru_cache(maxsize=32)
+def _merchant_service_level_rows(selected_normalized):
+    """(service, 'Yes'/'No') pairs for SERVICE_LEVELS given a frozenset of normalized selections."""
+    return tuple(
+        (service, 'Yes' if normalize_service_name(service) in selected_normalized else 'No')
+        for service in SERVICE_LEVELS
+    )
 
 def update_pricing_summary_merchant_service_levels(ws, selected_services, normalized_df=None):
     """Update Use in Pricing for Merchant Service Levels section."""
-    selected_normalized = {normalize_service_name(s) for s in (selected_services or [])}
+    selected_normalized = frozenset(normalize_service_name(s) for s in (selected_services or []))
 
     stop_titles = {'REDO CARRIERS', 'MERCHANT CARRIERS'}
     header_row_idx, label_col, use_col, rows = _scan_section_rows(
@@ -3479,12 +3758,10 @@ def update_pricing_summary_merchant_service_levels(ws, selected_services, normal
     )
     if header_row_idx is None:
         return
-    services = SERVICE_LEVELS
     row_idx = header_row_idx + 1
-    for service in services:
+    for service, use_value in _merchant_service_level_rows(selected_normalized):
         ws.cell(row_idx, label_col, service)
-        normalized = normalize_service_name(service)
-        ws.cell(row_idx, use_col, 'Yes' if normalized in selected_normalized else 'No')
+        ws.cell(row_idx, use_col, use_value)
         row_idx += 1
 
     # Clear remaining rows up to next section (with max_row limit to prevent infinite loops)
@@ -3501,23 +3778,24 @@ def update_pricing_summary_merchant_service_levels(ws, selected_services, normal
 def detect_structure(csv_path):
     """Detect if invoice is zone-based or zip-based"""
     with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        headers = [h.lower() for h in reader.fieldnames or []]
-        # Check for zone column (case-insensitive, allow variants)
-        zone_keywords = ['zone', 'shipment - zone', 'shipment-zone']
-        has_zone = any(any(kw in h for h in headers) for kw in zone_keywords)
-        return 'zone' if has_zone else 'zip'
+        headers = [h.lower() for h in next(csv.reader(f), [])]
+    # Check for zone column (case-insensitive); variants like "Shipment - Zone" contain "zone" too
+    has_zone = any('zone' in h for h in headers)
+    return 'zone' if has_zone else 'zip'
+
+_WEIGHT_UNIT_NOISE = re.compile(r'[^a-z0-9\s]')
+# Checked in order; the first unit whose pattern matches wins
+_WEIGHT_UNIT_PATTERNS = (
+    ('oz', re.compile(r'\b(oz|ounce|ounces)\b')),
+    ('lb', re.compile(r'\b(lb|lbs|pound|pounds)\b')),
+    ('kg', re.compile(r'\b(kg|kilogram|kilograms)\b'))
+)
 
 def _detect_weight_unit_from_text(text):
     if not text:
         return None
-    cleaned = re.sub(r'[^a-z0-9\s]', ' ', str(text).lower())
-    patterns = {
-        'oz': re.compile(r'\b(oz|ounce|ounces)\b'),
-        'lb': re.compile(r'\b(lb|lbs|pound|pounds)\b'),
-        'kg': re.compile(r'\b(kg|kilogram|kilograms)\b')
-    }
-    for unit, pattern in patterns.items():
+    cleaned = _WEIGHT_UNIT_NOISE.sub(' ', str(text).lower())
+    for unit, pattern in _WEIGHT_UNIT_PATTERNS:
         if pattern.search(cleaned):
             return unit
     return None
@@ -3525,7 +3803,8 @@ def _detect_weight_unit_from_text(text):
 def detect_weight_unit_from_values(series, sample_size=50):
     if series is None:
         return None
-    sample = series.dropna().astype(str).head(sample_size)
+    # Take the sample before astype(str) so only sample_size values are stringified
+    sample = series.dropna().head(sample_size).astype(str)
     counts = {'oz': 0, 'lb': 0, 'kg': 0}
     for value in sample:
         unit = _detect_weight_unit_from_text(value)
@@ -3580,7 +3859,7 @@ def _avg_label_cost_from_job(job_dir):
     if not normalized_csv.exists():
         return None
     try:
-        df = pd.read_csv(normalized_csv)
+        df = _read_normalized_frame(job_dir, columns=['Label Cost', 'LABEL_COST'])
     except Exception:
         return None
     if df.empty:
@@ -3602,7 +3881,7 @@ def _carrier_distribution(job_dir, mapping_config, available_carriers):
     if not normalized_csv.exists():
         return {carrier: 0 for carrier in available_carriers}
     try:
-        df = pd.read_csv(normalized_csv)
+        df = _read_normalized_frame(job_dir, columns=['Shipping Carrier', 'Shipping Service'])
     except Exception:
         return {carrier: 0 for carrier in available_carriers}
     if df.empty:
@@ -3613,94 +3892,98 @@ def _carrier_distribution(job_dir, mapping_config, available_carriers):
     service_series = service_series.fillna("").astype(str)
     counts = {carrier: 0 for carrier in available_carriers}
     total = len(df)
-    for carrier_val, service_val in zip(carrier_series, service_series):
-        inferred = infer_redo_carrier(carrier_val, service_val)
+    # Infer once per distinct carrier/service text (same string infer_redo_carrier builds)
+    codes, combined = pd.factorize(carrier_series + ' ' + service_series)
+    combined_counts = np.bincount(codes, minlength=len(combined))
+    for text, count in zip(combined, combined_counts):
+        inferred = _infer_redo_carrier_text(text)
         if inferred in counts:
-            counts[inferred] += 1
+            counts[inferred] += int(count)
     if total <= 0:
         return {carrier: 0 for carrier in available_carriers}
     return {carrier: counts.get(carrier, 0) / total for carrier in available_carriers}
 
+_LABEL_COST_BAD_TOKENS = ('insurance', 'labelcreatedate', 'create date', 'createdate', 'shipdate', 'date')
+_SUGGEST_MAPPING_RULES = {
+    'Order Number': {
+        'positive': ['order number', 'order #', 'order no', 'order id', 'ordernumber', 'orderid', 'order'],
+        'negative': ['date', 'ship', 'time']
+    },
+    'Order Date': {
+        'positive': ['order date', 'ship date', 'shipped date', 'orderdate', 'shipdate', 'date', 'shipped'],
+        'negative': ['number', 'id', '#', 'qty', 'count']
+    },
+    'Zip': {
+        'positive': ['zip', 'postal', 'postal code', 'zipcode', 'postalcode'],
+        'negative': []
+    },
+    'Weight': {
+        'positive': ['weight', 'oz', 'ounce', 'lb', 'lbs', 'pound', 'kg', 'kilogram'],
+        'negative': ['unit']
+    },
+    'Shipping Carrier': {
+        'positive': ['carrier', 'shipper', 'courier'],
+        'negative': ['service', 'method', 'level']
+    },
+    'Shipping Service': {
+        'positive': ['service', 'method', 'level'],
+        'negative': ['carrier']
+    },
+    'Package Height': {
+        'positive': ['height', 'ht'],
+        'negative': ['weight', 'lb', 'lbs', 'oz', 'ounce', 'unit']
+    },
+    'Package Width': {
+        'positive': ['width', 'wd'],
+        'negative': ['weight', 'lb', 'lbs', 'oz', 'ounce', 'unit']
+    },
+    'Package Length': {
+        'positive': ['length', 'len'],
+        'negative': ['weight', 'lb', 'lbs', 'oz', 'ounce', 'unit']
+    },
+    'Zone': {
+        'positive': ['zone'],
+        'negative': []
+    },
+    'Label Cost': {
+        'positive': ['label cost', 'shipping rate', 'rate', 'postage', 'cost', 'carrier fee', 'fee'],
+        'negative': ['insurance', 'labelcreatedate', 'createdate', 'shipdate', 'date']
+    }
+}
+
+@lru_cache(maxsize=32)
+def _mapping_column_features(columns):
+    """(lowercase, compact, tokens, padded token text) per column label, shared by every field's suggestion."""
+    features = []
+    for c in columns:
+        col = str(c).lower()
+        tokens = tuple(_NON_ALNUM_RUN.sub(' ', col).strip().split())
+        features.append((col, _NON_ALNUM_RUN.sub('', col), tokens, f" {' '.join(tokens)} "))
+    return tuple(features)
+
 def suggest_mapping(invoice_columns, standard_field):
     """Suggest best matching column for a standard field"""
-    invoice_lower = [str(c).lower() for c in invoice_columns]
-    field_lower = standard_field.lower()
+    features = _mapping_column_features(tuple(invoice_columns))
+    is_label_cost = standard_field == 'Label Cost'
 
-    def _compact(text):
-        return re.sub(r'[^a-z0-9]+', '', text.lower())
-
-    def _tokenize(text):
-        cleaned = re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
-        return cleaned.split()
-    
     def _is_bad_label_cost(col_text):
-        bad_tokens = ('insurance', 'labelcreatedate', 'create date', 'createdate', 'shipdate', 'date')
-        return any(token in col_text for token in bad_tokens)
+        return any(token in col_text for token in _LABEL_COST_BAD_TOKENS)
 
-    compact_field = _compact(standard_field)
-    for i, col in enumerate(invoice_lower):
-        if _compact(col) == compact_field:
-            if standard_field == 'Label Cost' and _is_bad_label_cost(col):
+    compact_field = _NON_ALNUM_RUN.sub('', standard_field.lower())
+    for i, (col, compact, _, _) in enumerate(features):
+        if compact == compact_field:
+            if is_label_cost and _is_bad_label_cost(col):
                 continue
             return invoice_columns[i]
 
-    rules = {
-        'Order Number': {
-            'positive': ['order number', 'order #', 'order no', 'order id', 'ordernumber', 'orderid', 'order'],
-            'negative': ['date', 'ship', 'time']
-        },
-        'Order Date': {
-            'positive': ['order date', 'ship date', 'shipped date', 'orderdate', 'shipdate', 'date', 'shipped'],
-            'negative': ['number', 'id', '#', 'qty', 'count']
-        },
-        'Zip': {
-            'positive': ['zip', 'postal', 'postal code', 'zipcode', 'postalcode'],
-            'negative': []
-        },
-        'Weight': {
-            'positive': ['weight', 'oz', 'ounce', 'lb', 'lbs', 'pound', 'kg', 'kilogram'],
-            'negative': ['unit']
-        },
-        'Shipping Carrier': {
-            'positive': ['carrier', 'shipper', 'courier'],
-            'negative': ['service', 'method', 'level']
-        },
-        'Shipping Service': {
-            'positive': ['service', 'method', 'level'],
-            'negative': ['carrier']
-        },
-        'Package Height': {
-            'positive': ['height', 'ht'],
-            'negative': ['weight', 'lb', 'lbs', 'oz', 'ounce', 'unit']
-        },
-        'Package Width': {
-            'positive': ['width', 'wd'],
-            'negative': ['weight', 'lb', 'lbs', 'oz', 'ounce', 'unit']
-        },
-        'Package Length': {
-            'positive': ['length', 'len'],
-            'negative': ['weight', 'lb', 'lbs', 'oz', 'ounce', 'unit']
-        },
-        'Zone': {
-            'positive': ['zone'],
-            'negative': []
-        },
-        'Label Cost': {
-            'positive': ['label cost', 'shipping rate', 'rate', 'postage', 'cost', 'carrier fee', 'fee'],
-            'negative': ['insurance', 'labelcreatedate', 'createdate', 'shipdate', 'date']
-        }
-    }
-
-    rule = rules.get(standard_field)
+    rule = _SUGGEST_MAPPING_RULES.get(standard_field)
     if not rule:
         return None
 
     best = (0, None)
-    for idx, col in enumerate(invoice_lower):
-        if standard_field == 'Label Cost' and _is_bad_label_cost(col):
+    for idx, (col, _, tokens, col_text) in enumerate(features):
+        if is_label_cost and _is_bad_label_cost(col):
             continue
-        tokens = _tokenize(col)
-        col_text = f" {' '.join(tokens)} "
         score = 0
         for phrase in rule['positive']:
             if phrase in col:
@@ -3724,21 +4007,49 @@ def suggest_mapping(invoice_columns, standard_field):
         return invoice_columns[best[1]]
     return None
 
+# Runs expire after 24 hours, so sweeping more often than this only repeats the stat() fan-out
+CLEAN_RUNS_INTERVAL_SECONDS = 300
+CLEAN_RUNS_MAX_WORKERS = 8
+_last_clean_runs = None
+_clean_runs_lock = threading.Lock()
+
 def clean_old_runs():
-    """Remove runs older than 24 hours"""
+    """Remove runs older than 24 hours (at most once per CLEAN_RUNS_INTERVAL_SECONDS)"""
+    global _last_clean_runs
+    with _clean_runs_lock:
+        now = time.monotonic()
+        if _last_clean_runs is not None and now - _last_clean_runs < CLEAN_RUNS_INTERVAL_SECONDS:
+            return
+        _last_clean_runs = now
     runs_dir = Path(app.config['UPLOAD_FOLDER'])
     if not runs_dir.exists():
         return
     
-    cutoff = datetime.now() - timedelta(hours=24)
-    for run_dir in runs_dir.iterdir():
-        if run_dir.is_dir():
+    cutoff = time.time() - 24 * 3600
+    expired = []
+    # scandir answers is_dir() from the directory entry; only directories get a stat()
+    with os.scandir(runs_dir) as entries:
+        for entry in entries:
             try:
-                mtime = datetime.fromtimestamp(run_dir.stat().st_mtime)
-                if mtime < cutoff:
-                    shutil.rmtree(run_dir)
-            except Exception:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    expired.append(entry.path)
+            except OSError:
                 pass
+    if len(expired) <= 1:
+        for path in expired:
+            shutil.rmtree(path, ignore_errors=True)
+        return
+    # rmtree is syscall-bound and releases the GIL, so a backlog of expired runs clears in parallel
+    with ThreadPoolExecutor(max_workers=min(CLEAN_RUNS_MAX_WORKERS, len(expired))) as executor:
+        list(executor.map(lambda path: shutil.rmtree(path, ignore_errors=True), expired))
+
+def _clean_old_runs_in_background():
+    """Start a sweep thread only when one is due, so request handlers never wait on rmtree."""
+    with _clean_runs_lock:
+        if _last_clean_runs is not None and time.monotonic() - _last_clean_runs < CLEAN_RUNS_INTERVAL_SECONDS:
+            return
+    # clean_old_runs re-checks the interval under the lock, so racing threads sweep once
+    threading.Thread(target=clean_old_runs, daemon=True).start()
 
 ADMIN_LOG_PATH = BASE_DIR / 'admin_log.xlsx'
 DEAL_SIZING_HEADERS = [
@@ -3785,6 +4096,31 @@ RATE_CARD_HEADERS = [
     'USPS Market $ Off'
 ]
 
+# Stat signature of the admin log when its headers were last confirmed; unchanged files skip the check
+_admin_log_verified_signature = None
+_admin_log_verified_lock = threading.Lock()
+
+def _admin_log_headers_current():
+    """True when both admin sheets exist with their expected header rows (read-only check)."""
+    global _admin_log_verified_signature
+    signature = _stat_signature(ADMIN_LOG_PATH)
+    with _admin_log_verified_lock:
+        if signature is not None and signature == _admin_log_verified_signature:
+            return True
+    wb = openpyxl.load_workbook(ADMIN_LOG_PATH, read_only=True)
+    try:
+        for sheet_name, headers in (('Deal sizing', DEAL_SIZING_HEADERS), ('Rate card + deal sizing', RATE_CARD_HEADERS)):
+            if sheet_name not in wb.sheetnames:
+                return False
+            header_row = next(wb[sheet_name].iter_rows(min_row=1, max_row=1, max_col=len(headers), values_only=True), ())
+            if list(header_row) != headers:
+                return False
+        with _admin_log_verified_lock:
+            _admin_log_verified_signature = signature
+        return True
+    finally:
+        wb.close()
+
 def _ensure_admin_log():
     if not ADMIN_LOG_PATH.exists():
         wb = openpyxl.Workbook()
@@ -3796,6 +4132,9 @@ def _ensure_admin_log():
         ws.append(RATE_CARD_HEADERS)
         wb.save(ADMIN_LOG_PATH)
         return
+    # Only rewrite the log when a sheet or header is missing; every admin view calls this
+    if _admin_log_headers_current():
+        return
 
     wb = openpyxl.load_workbook(ADMIN_LOG_PATH)
     if 'Deal sizing' not in wb.sheetnames:
@@ -3815,10 +4154,12 @@ def _ensure_admin_log():
     wb.save(ADMIN_LOG_PATH)
 
 def _upsert_admin_row(ws, job_id, row_values):
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-        if str(row[1].value) == str(job_id):
+    job_id = str(job_id)
+    # Scan only the Job ID column; the matching row is rewritten in place
+    for (id_cell,) in ws.iter_rows(min_row=2, min_col=2, max_col=2):
+        if str(id_cell.value) == job_id:
             for idx, value in enumerate(row_values, start=1):
-                row[idx - 1].value = value
+                ws.cell(row=id_cell.row, column=idx, value=value)
             return
     ws.append(row_values)
 
@@ -3826,10 +4167,10 @@ def log_admin_entry(job_id, mapping_config, merchant_pricing, redo_config):
     """Log admin entry asynchronously to avoid blocking main thread."""
     def _log_async():
         try:
-            _ensure_admin_log()
             flow_type = mapping_config.get('flow_type', 'rate_card_plus_deal_sizing') if mapping_config else ''
             if flow_type == 'deal_sizing':
                 return
+            _ensure_admin_log()
             sheet_name = 'Deal sizing' if flow_type == 'deal_sizing' else 'Rate card + deal sizing'
             pct_off, dollar_off = _usps_market_discount_values(mapping_config)
             row = [
@@ -3862,7 +4203,7 @@ def log_admin_entry(job_id, mapping_config, merchant_pricing, redo_config):
 @app.route('/')
 def index():
     # Defer cleanup and preloading to background threads for fast health check response
-    threading.Thread(target=clean_old_runs, daemon=True).start()
+    _clean_old_runs_in_background()
     # Start loading zone map in background so it's ready when user needs it
     def _warm_zone_cache():
         global _ZONE_MAP
@@ -3873,7 +4214,7 @@ def index():
 
 @app.route('/upload')
 def upload_page():
-    clean_old_runs()
+    _clean_old_runs_in_background()
     return render_template('screen1.html')
 
 @app.route('/deal-sizing')
@@ -3882,17 +4223,19 @@ def deal_sizing_page():
 
 def _build_admin_view_data():
     _ensure_admin_log()
-    wb = openpyxl.load_workbook(ADMIN_LOG_PATH, data_only=True)
+    wb = openpyxl.load_workbook(ADMIN_LOG_PATH, data_only=True, read_only=True)
     deal_ws = wb['Deal sizing'] if 'Deal sizing' in wb.sheetnames else None
     rate_ws = wb['Rate card + deal sizing'] if 'Rate card + deal sizing' in wb.sheetnames else None
 
     def _sheet_data(ws):
         if ws is None:
             return {'headers': [], 'rows': [], 'row_ids': []}
-        headers = [cell.value for cell in next(ws.iter_rows(min_row=1, max_row=1))]
+        # One streaming pass: header row first, then the data rows
+        sheet_rows = ws.iter_rows(values_only=True)
+        headers = list(next(sheet_rows, ()))
         rows = []
         row_ids = []
-        for idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+        for idx, row in enumerate(sheet_rows, start=2):
             rows.append(list(row))
             row_ids.append(idx)
         if 'Timestamp' in headers:
@@ -3914,6 +4257,7 @@ def _build_admin_view_data():
 
     deal_data = _sheet_data(deal_ws)
     rate_data = _sheet_data(rate_ws)
+    wb.close()
 
     def _format_currency(value):
         try:
@@ -4359,21 +4703,21 @@ def _build_admin_view_data():
                 if mapping_file.exists():
                     try:
                         with open(mapping_file, 'r') as f:
-                            mapping_config = json.load(f)
+                            mapping_config = _json_load(f)
                     except Exception:
                         mapping_config = {}
                 pricing_file = job_dir / 'merchant_pricing.json'
                 if pricing_file.exists():
                     try:
                         with open(pricing_file, 'r') as f:
-                            merchant_pricing = json.load(f)
+                            merchant_pricing = _json_load(f)
                     except Exception:
                         merchant_pricing = {}
                 redo_file = job_dir / 'redo_carriers.json'
                 if redo_file.exists():
                     try:
                         with open(redo_file, 'r') as f:
-                            redo_config = json.load(f)
+                            redo_config = _json_load(f)
                     except Exception:
                         redo_config = {}
 
@@ -4660,7 +5004,7 @@ def save_deal_sizing_inputs(job_id):
         return jsonify({'error': 'Mapping not found'}), 404
     try:
         with open(mapping_file, 'r') as f:
-            mapping_config = json.load(f)
+            mapping_config = _json_load(f)
     except Exception:
         mapping_config = {}
     mapping_config['deal_sizing_inputs'] = payload
@@ -4692,7 +5036,7 @@ def save_deal_sizing_inputs(job_id):
             redo_file = job_dir / 'redo_carriers.json'
             if redo_file.exists():
                 with open(redo_file, 'r') as f:
-                    redo_config = json.load(f)
+                    redo_config = _json_load(f)
                 selected = redo_config.get('selected_carriers', [])
                 changed = False
                 if eligibility['amazon_eligible_final'] and 'Amazon' not in selected:
@@ -4715,7 +5059,7 @@ def save_deal_sizing_inputs(job_id):
             pricing_file = job_dir / 'merchant_pricing.json'
             if pricing_file.exists():
                 with open(pricing_file, 'r') as f:
-                    merchant_pricing = json.load(f)
+                    merchant_pricing = _json_load(f)
                 excluded = merchant_pricing.get('excluded_carriers', [])
                 changed = False
                 if eligibility['amazon_eligible_final'] and 'Amazon' in excluded:
@@ -4880,7 +5224,7 @@ def mapping_page():
     suggested_mapping = {}
     if mapping_file.exists():
         with open(mapping_file, 'r') as f:
-            config = json.load(f)
+            config = _json_load(f)
             suggested_mapping = config.get('mapping', {})
     
     # Suggest mappings
@@ -4924,7 +5268,7 @@ def service_levels_page():
         return render_template('screen1.html'), 404
 
     with open(mapping_file, 'r') as f:
-        mapping_config = json.load(f)
+        mapping_config = _json_load(f)
 
     raw_df = pd.read_csv(job_dir / 'raw_invoice.csv')
     available_services = available_merchant_services(raw_df, mapping_config)
@@ -4933,7 +5277,7 @@ def service_levels_page():
     service_file = job_dir / 'service_levels.json'
     if service_file.exists():
         with open(service_file, 'r') as f:
-            config = json.load(f)
+            config = _json_load(f)
             selected_services = config.get('selected_services', [])
 
     return render_template('service_levels.html',
@@ -4990,7 +5334,7 @@ def ready_page():
     mapping_file = job_dir / 'mapping.json'
     if mapping_file.exists():
         with open(mapping_file, 'r') as f:
-            config = json.load(f)
+            config = _json_load(f)
             merchant_name = config.get('merchant_name', 'Merchant')
     
     return render_template('screen3.html', job_id=job_id, merchant_name=merchant_name)
@@ -5008,7 +5352,7 @@ def dashboard_page():
     mapping_file = job_dir / 'mapping.json'
     if mapping_file.exists():
         with open(mapping_file, 'r') as f:
-            config = json.load(f)
+            config = _json_load(f)
             merchant_name = config.get('merchant_name', 'Merchant')
     return render_template('dashboard.html', job_id=job_id, merchant_name=merchant_name)
 
@@ -5049,27 +5393,27 @@ def upload():
                 non_empty_cols = sum(1 for c in columns if c)
                 return keyword_hits * 10 + non_empty_cols
 
-            df_upload = max(sheets.values(), key=score_sheet)
+            if len(sheets) == 1:
+                df_upload = next(iter(sheets.values()))
+            else:
+                df_upload = max(sheets.values(), key=score_sheet)
             df_upload.columns = [
                 str(c).strip() if c is not None else ''
                 for c in df_upload.columns
             ]
             def _ensure_shipping_service_column(frame):
-                normalized = {
-                    re.sub(r'\W+', '', str(c).strip().lower()): c for c in frame.columns
-                }
+                normalized = dict(_normalized_column_items(tuple(frame.columns)))
                 if 'shippingservice' in normalized:
-                    return frame
+                    return frame, normalized
                 if frame.shape[1] > 28:
                     cols = list(frame.columns)
                     cols[28] = 'ShippingService'
                     frame.columns = cols
-                return frame
+                    # Rebuild rather than pop: another column may share the replaced label's key
+                    normalized = dict(_normalized_column_items(tuple(cols)))
+                return frame, normalized
 
-            df_upload = _ensure_shipping_service_column(df_upload)
-            normalized_cols = {
-                re.sub(r'\W+', '', str(c).strip().lower()): c for c in df_upload.columns
-            }
+            df_upload, normalized_cols = _ensure_shipping_service_column(df_upload)
             if 'shippingservice' not in normalized_cols and 'shipping_service' not in normalized_cols:
                 raw_sheet_name = None
                 for name, sheet_df in sheets.items():
@@ -5083,7 +5427,7 @@ def upload():
                 for idx in range(min(20, len(df_raw))):
                     row_values = df_raw.iloc[idx].fillna('').astype(str)
                     normalized_row = [
-                        re.sub(r'\W+', '', val.strip().lower()) for val in row_values
+                        _NON_WORD_RUN.sub('', val.strip().lower()) for val in row_values
                     ]
                     if any('shippingservice' in val or ('shipping' in val and 'service' in val) for val in normalized_row):
                         header_row = idx
@@ -5093,7 +5437,7 @@ def upload():
                     df_upload = df_raw.iloc[header_row + 1:].copy()
                     df_upload.columns = [str(c).strip() for c in header_values]
                     df_upload = df_upload.loc[:, df_upload.columns != '']
-                    df_upload = _ensure_shipping_service_column(df_upload)
+                    df_upload, _ = _ensure_shipping_service_column(df_upload)
             df_upload.to_csv(raw_csv_path, index=False)
         else:
             file.save(raw_csv_path)
@@ -5109,15 +5453,13 @@ def upload():
         merchant_name_suggestion = None
         
         # Record upload phase timestamp with started_at as baseline
-        progress_file = job_dir / 'progress.json'
         now = datetime.now(timezone.utc).isoformat()
-        with open(progress_file, 'w') as f:
-            json.dump({
-                'started_at': now,
-                'phase_timestamps': {
-                    'upload': now
-                }
-            }, f)
+        _write_progress_file(job_dir, {
+            'started_at': now,
+            'phase_timestamps': {
+                'upload': now
+            }
+        })
         
         return jsonify({
             'job_id': job_id,
@@ -5223,12 +5565,16 @@ def mapping():
         # Zone will be included if mapped by user
         # If zone-based and zone column exists but wasn't mapped, we'll handle it in generation
         
-        # Create normalized DataFrame
-        normalized_df = pd.DataFrame(normalized_data)
-        for col in normalized_df.select_dtypes(include=['category']).columns:
-            normalized_df[col] = normalized_df[col].astype(object)
-        if 'Weight (oz)' in normalized_df.columns and 'Weight' not in normalized_df.columns:
-            normalized_df['Weight'] = normalized_df['Weight (oz)']
+        # Collect mapped and derived columns, then build the normalized DataFrame once
+        cols = {}
+        for field, series in normalized_data.items():
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype(object)
+            cols[field] = series
+        row_index = df.index
+        row_count = len(row_index)
+        if 'Weight (oz)' in cols and 'Weight' not in cols:
+            cols['Weight'] = cols['Weight (oz)']
             if not detected_weight_unit:
                 detected_weight_unit = 'oz'
 
@@ -5239,42 +5585,52 @@ def mapping():
                 country_series = df[col]
                 break
 
+        country_str = None
         if country_series is not None:
             country_str = country_series.fillna("").astype(str).str.strip()
+            if country_str.eq("").all():
+                country_str = None
+
+        # COUNTRY_NAME_TO_CODE / CODE_TO_COUNTRY_NAME keys are already uppercase
+        mapped_codes = pd.Series([""] * row_count, index=row_index)
+        if country_str is not None:
             country_upper = country_str.str.upper()
             is_two_letter = country_upper.str.len().eq(2) & country_upper.str.isalpha()
 
             mapped_codes = country_upper.map(COUNTRY_NAME_TO_CODE).fillna("")
-            normalized_df['TWO_LETTER_COUNTRY_CODE'] = np.where(
+            cols['TWO_LETTER_COUNTRY_CODE'] = np.where(
                 is_two_letter, country_upper, mapped_codes
             )
-            normalized_df['FULL_COUNTRY_NAME'] = np.where(
+            cols['FULL_COUNTRY_NAME'] = np.where(
                 is_two_letter,
                 country_upper.map(CODE_TO_COUNTRY_NAME).fillna(""),
                 country_str
             )
+            two_letter = pd.Series(cols['TWO_LETTER_COUNTRY_CODE'], index=row_index)
         else:
-            normalized_df['TWO_LETTER_COUNTRY_CODE'] = ""
-            normalized_df['FULL_COUNTRY_NAME'] = ""
+            cols['TWO_LETTER_COUNTRY_CODE'] = ""
+            cols['FULL_COUNTRY_NAME'] = ""
+            two_letter = pd.Series([""] * row_count, index=row_index)
 
-        two_letter = normalized_df['TWO_LETTER_COUNTRY_CODE'].fillna("").astype(str)
-        full_name = normalized_df['FULL_COUNTRY_NAME'].fillna("").astype(str)
-        mapped_from_name = full_name.str.upper().map(COUNTRY_NAME_TO_CODE).fillna("")
-        zip_series = normalized_df['Zip'] if 'Zip' in normalized_df.columns else pd.Series([""] * len(normalized_df))
-        zip_match = zip_series.fillna("").astype(str).str.extract(r'(\d{5})', expand=False)
-        has_zip = zip_match.notna()
+        # Wherever two_letter is blank, FULL_COUNTRY_NAME is the raw country text,
+        # so its code lookup is the one already done above.
+        mapped_from_name = mapped_codes
+        zip_series = cols['Zip'] if 'Zip' in cols else pd.Series([""] * row_count, index=row_index)
+        has_zip = zip_series.fillna("").astype(str).str.contains(_ZIP5, na=False)
 
         calculated_code = two_letter.mask(two_letter.eq(""), mapped_from_name)
         calculated_code = calculated_code.mask(calculated_code.eq(""), np.where(has_zip, "US", ""))
-        normalized_df['CALCULATED_TWO_LETTER_COUNTRY_CODE'] = calculated_code
+        cols['CALCULATED_TWO_LETTER_COUNTRY_CODE'] = calculated_code
 
-        if structure == 'zip' and 'Zip' in normalized_df.columns:
+        if structure == 'zip' and 'Zip' in cols:
             origin_zip3 = _zip3_from_zip(origin_zip)
             zone_map = _fetch_usps_zone_chart(origin_zip3)
             if zone_map:
-                dest_zip3 = normalized_df['Zip'].apply(_zip3_from_zip)
+                # Vectorized _zip3_from_zip: first three digits, None when fewer than three
+                dest_digits = cols['Zip'].astype(str).str.replace(r'\D', '', regex=True)
+                dest_zip3 = dest_digits.str[:3].where(dest_digits.str.len() >= 3)
                 zone_values = dest_zip3.map(zone_map)
-                normalized_df['Zone'] = pd.to_numeric(zone_values, errors='coerce')
+                cols['Zone'] = pd.to_numeric(zone_values, errors='coerce')
             else:
                 return jsonify({
                     'error': (
@@ -5285,83 +5641,70 @@ def mapping():
                 }), 500
 
         shipping_service_series = (
-            normalized_df['Shipping Service']
-            if 'Shipping Service' in normalized_df.columns
-            else pd.Series([""] * len(normalized_df))
+            cols['Shipping Service']
+            if 'Shipping Service' in cols
+            else pd.Series([""] * row_count, index=row_index)
         )
         cleaned_service = shipping_service_series.fillna("").astype(str)
         cleaned_service = cleaned_service.str.replace('Â', '', regex=False).str.replace('®', '', regex=False)
         cleaned_service = cleaned_service.str.split(r'\s*[-–—]\s*', n=1, expand=True)[0]
         cleaned_service = cleaned_service.str.replace(r'[^\w\s]', ' ', regex=True)
         cleaned_service = cleaned_service.str.replace(r'\s+', ' ', regex=True).str.upper().str.strip()
-        normalized_df['CLEANED_SHIPPING_SERVICE'] = cleaned_service
-
-        priority = pd.Series([""] * len(normalized_df))
-        non_empty = cleaned_service.ne("")
-        priority = priority.mask(non_empty & cleaned_service.str.contains('GROUND', regex=False), 'GROUND')
-        air_mask = non_empty & cleaned_service.str.contains(r'2ND DAY|2 DAY|2DAY', regex=True)
-        priority = priority.mask(priority.eq("") & air_mask, 'AIR')
-        exp_mask = non_empty & cleaned_service.str.contains('EXPEDITED', regex=False)
-        priority = priority.mask(priority.eq("") & exp_mask, 'EXPEDITED')
-        priority = priority.mask((priority.eq("")) & non_empty, 'OTHER')
-        normalized_df['SHIPPING_PRIORITY'] = priority
+        cols['CLEANED_SHIPPING_SERVICE'] = cleaned_service
+
+        # Few distinct services per invoice: classify each once and broadcast to the rows
+        cols['SHIPPING_PRIORITY'] = cleaned_service.map({
+            service: calculate_shipping_priority(service) for service in cleaned_service.unique()
+        })
 
         weight_series = None
-        if 'Weight' in normalized_df.columns:
-            weight_series = pd.to_numeric(normalized_df['Weight'], errors='coerce')
+        if 'Weight' in cols:
+            weight_series = pd.to_numeric(cols['Weight'], errors='coerce')
         else:
-            weight_series = pd.Series([np.nan] * len(normalized_df))
+            weight_series = pd.Series(np.nan, index=row_index)
 
         if detected_weight_unit == 'oz':
-            normalized_df['WEIGHT_IN_OZ'] = weight_series.round(4)
-            normalized_df['WEIGHT_IN_LBS'] = (weight_series / 16).round(4)
+            cols['WEIGHT_IN_OZ'] = weight_series.round(4)
+            cols['WEIGHT_IN_LBS'] = (weight_series / 16).round(4)
         elif detected_weight_unit == 'lb':
-            normalized_df['WEIGHT_IN_LBS'] = weight_series.round(4)
-            normalized_df['WEIGHT_IN_OZ'] = pd.Series([np.nan] * len(normalized_df))
+            cols['WEIGHT_IN_LBS'] = weight_series.round(4)
+            cols['WEIGHT_IN_OZ'] = np.nan
         elif detected_weight_unit == 'kg':
-            normalized_df['WEIGHT_IN_LBS'] = (weight_series * 2.2046226218).round(4)
-            normalized_df['WEIGHT_IN_OZ'] = (weight_series * 35.27396195).round(4)
+            cols['WEIGHT_IN_LBS'] = (weight_series * 2.2046226218).round(4)
+            cols['WEIGHT_IN_OZ'] = (weight_series * 35.27396195).round(4)
         else:
-            normalized_df['WEIGHT_IN_LBS'] = pd.Series([np.nan] * len(normalized_df))
-            normalized_df['WEIGHT_IN_OZ'] = pd.Series([np.nan] * len(normalized_df))
+            cols['WEIGHT_IN_LBS'] = np.nan
+            cols['WEIGHT_IN_OZ'] = np.nan
 
         def _numeric_series(series_name):
-            if series_name in normalized_df.columns:
-                return pd.to_numeric(normalized_df[series_name], errors='coerce')
-            return pd.Series([None] * len(normalized_df))
+            if series_name in cols:
+                return pd.to_numeric(cols[series_name], errors='coerce')
+            return pd.Series([None] * row_count, index=row_index)
 
         length = _numeric_series('Package Length')
         width = _numeric_series('Package Width')
         height = _numeric_series('Package Height')
         volume = length * width * height
-        normalized_df['PACKAGE_DIMENSION_VOLUME'] = volume
-
-        size_bins = [-float('inf'), SMALL_MAX_VOLUME, MEDIUM_MAX_VOLUME, float('inf')]
-        size_labels = ['SMALL', 'MEDIUM', 'LARGE']
-        size_class = pd.Series(
-            pd.cut(volume, bins=size_bins, labels=size_labels, right=False),
-            index=volume.index
-        ).astype(object)
-        normalized_df['PACKAGE_SIZE_STATUS'] = size_class.where(volume.notna(), "")
-
-        weight_lbs = normalized_df['WEIGHT_IN_LBS']
-        weight_bins = [-float('inf'), 1, 5, 10, float('inf')]
-        weight_labels = ['<1', '1-5', '5-10', '10+']
-        weight_class = pd.Series(
-            pd.cut(weight_lbs, bins=weight_bins, labels=weight_labels, right=False),
-            index=weight_lbs.index
-        ).astype(object)
-        normalized_df['WEIGHT_CLASSIFICATION'] = weight_class.where(weight_lbs.notna(), "")
+        cols['PACKAGE_DIMENSION_VOLUME'] = volume
+
+        volume_values = volume.to_numpy(dtype=np.float64)
+        size_idx = np.searchsorted(_PACKAGE_SIZE_THRESHOLDS, volume_values, side='right')
+        cols['PACKAGE_SIZE_STATUS'] = np.where(np.isnan(volume_values), "", _PACKAGE_SIZE_LABELS[size_idx])
+
+        weight_lbs_values = np.broadcast_to(np.asarray(cols['WEIGHT_IN_LBS'], dtype=np.float64), (row_count,))
+        weight_idx = np.searchsorted(_WEIGHT_CLASS_THRESHOLDS, weight_lbs_values, side='right')
+        cols['WEIGHT_CLASSIFICATION'] = np.where(np.isnan(weight_lbs_values), "", _WEIGHT_CLASS_LABELS[weight_idx])
 
         origin_zip_value = extract_origin_zip(origin_zip)
         if structure == 'zip':
-            normalized_df['ORIGIN_ZIP_CODE'] = [origin_zip_value] * len(normalized_df)
+            cols['ORIGIN_ZIP_CODE'] = origin_zip_value
         else:
-            normalized_df['ORIGIN_ZIP_CODE'] = ["" for _ in range(len(normalized_df))]
+            cols['ORIGIN_ZIP_CODE'] = ""
+
+        normalized_df = pd.DataFrame(cols, index=row_index, copy=False)
         
-        # Save normalized CSV
-        normalized_csv_path = job_dir / 'normalized.csv'
-        normalized_df.to_csv(normalized_csv_path, index=False)
+        # Save normalized CSV (plus parquet copy when available)
+        _write_normalized_frame(job_dir, normalized_df)
         
         return jsonify({'success': True})
     except Exception as e:
@@ -5404,7 +5747,7 @@ def get_service_levels(job_id):
             return jsonify({'error': 'Mapping not found'}), 404
 
         with open(mapping_file, 'r') as f:
-            mapping_config = json.load(f)
+            mapping_config = _json_load(f)
 
         raw_df = pd.read_csv(job_dir / 'raw_invoice.csv')
         available_services = available_merchant_services(raw_df, mapping_config)
@@ -5485,7 +5828,7 @@ def merchant_pricing(job_id):
         has_saved = False
         if pricing_file.exists():
             with open(pricing_file, 'r') as f:
-                saved = json.load(f)
+                saved = _json_load(f)
             has_saved = True
 
         mapping_file = job_dir / 'mapping.json'
@@ -5493,7 +5836,7 @@ def merchant_pricing(job_id):
             return jsonify({'error': 'Mapping not found'}), 404
 
         with open(mapping_file, 'r') as f:
-            mapping_config = json.load(f)
+            mapping_config = _json_load(f)
 
         raw_df = pd.read_csv(job_dir / 'raw_invoice.csv')
         available_services = available_merchant_services(raw_df, mapping_config)
@@ -5594,7 +5937,7 @@ def redo_carriers(job_id):
             return jsonify({'error': 'Mapping not found'}), 404
 
         with open(mapping_file, 'r') as f:
-            mapping_config = json.load(f)
+            mapping_config = _json_load(f)
 
         eligibility = compute_eligibility(
             mapping_config.get('origin_zip'),
@@ -5643,7 +5986,7 @@ def redo_carriers(job_id):
         if redo_file.exists():
             try:
                 with open(redo_file, 'r') as f:
-                    saved_redo = json.load(f)
+                    saved_redo = _json_load(f)
                 rs = saved_redo.get('selected_carriers', [])
                 changed = False
                 if eligibility['amazon_eligible_final'] and 'Amazon' not in rs:
@@ -5677,7 +6020,7 @@ def redo_carriers(job_id):
 
 @app.route('/api/generate', methods=['POST'])
 def generate():
-    """Start rate card generation - generates Excel synchronously for accurate calculations"""
+    """Start rate card generation in a background thread; poll /api/status for completion"""
     _preload_resources()  # Ensure resources are loaded before generation
     try:
         data = request.json
@@ -5689,19 +6032,82 @@ def generate():
         job_dir = Path(app.config['UPLOAD_FOLDER']) / job_id
         if not job_dir.exists():
             return jsonify({'error': 'Job not found'}), 404
+        if not (job_dir / 'mapping.json').exists():
+            return jsonify({'error': 'Mapping not found'}), 400
         
+        # A second start while a run is in flight (in any worker) just polls the existing run
+        if _claim_generation(job_dir):
+            try:
+                _reset_generation_state(job_dir)
+                thread = threading.Thread(target=_run_generation_with_setup, args=(job_dir,), daemon=True)
+                thread.start()
+            except Exception:
+                _release_generation(job_dir)
+                raise
+        return jsonify({'success': True, 'status': 'started'})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Exclusive per-job marker while a generation runs; shared by all worker processes
+GENERATION_MARKER = '.generation_running'
+# A marker this old belongs to a worker that died mid-run
+GENERATION_MARKER_STALE_SECONDS = 600
+
+def _claim_generation(job_dir):
+    """Create the job's generation marker with O_EXCL; False when another run holds it."""
+    marker = Path(job_dir) / GENERATION_MARKER
+    for _ in range(2):
+        try:
+            fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                age = time.time() - marker.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if age < GENERATION_MARKER_STALE_SECONDS:
+                return False
+            marker.unlink(missing_ok=True)
+            continue
+        os.close(fd)
+        return True
+    return False
+
+def _release_generation(job_dir):
+    (Path(job_dir) / GENERATION_MARKER).unlink(missing_ok=True)
+
+def _generation_running(job_dir):
+    return (Path(job_dir) / GENERATION_MARKER).exists()
+
+# progress.json keys a previous run leaves behind that status() would read as this run's outcome
+_GENERATION_RESULT_KEYS = ('error', 'excel_complete', 'normalize', 'qualification', 'write_template', 'saving')
+
+def _reset_generation_state(job_dir):
+    """Clear the previous run's error and completion flags before a new run.
+
+    Rate card files stay until the new run replaces them; status() ignores them while the
+    generation marker exists.
+    """
+    with _progress_write_lock:
+        progress = _read_progress(job_dir)
+        if any(key in progress for key in _GENERATION_RESULT_KEYS):
+            for key in _GENERATION_RESULT_KEYS:
+                progress.pop(key, None)
+            _write_progress_file(job_dir, progress)
+
+def _run_generation_with_setup(job_dir):
+    """Load configs, initialize progress and run fast generation (runs off the request thread)."""
+    try:
         # Load configs
         with open(job_dir / 'mapping.json', 'r') as f:
-            mapping_config = json.load(f)
+            mapping_config = _json_load(f)
         
         merchant_pricing = {'excluded_carriers': [], 'included_services': []}
         pricing_file = job_dir / 'merchant_pricing.json'
         if pricing_file.exists():
             with open(pricing_file, 'r') as f:
-                merchant_pricing = json.load(f)
+                merchant_pricing = _json_load(f)
         
         # Initialize progress
-        progress_file = job_dir / 'progress.json'
         normalized_csv = job_dir / 'normalized.csv'
         # Fast mode estimate is ~3-5s (Python calculations only, no Excel I/O)
         estimated_seconds = 5
@@ -5718,12 +6124,10 @@ def generate():
 
         # Merge with existing progress to preserve upload/mapping phase timestamps
         existing_progress = {}
-        if progress_file.exists():
-            try:
-                with open(progress_file, 'r') as f:
-                    existing_progress = json.load(f)
-            except Exception:
-                pass
+        try:
+            existing_progress = _read_progress(job_dir)
+        except Exception:
+            pass
         
         # Update with generation start info, preserving phase_timestamps
         existing_progress['eta_seconds'] = estimated_seconds
@@ -5733,33 +6137,65 @@ def generate():
             existing_progress['phase_timestamps'] = {}
         existing_progress['phase_timestamps']['generation_start'] = datetime.now(timezone.utc).isoformat()
         
-        with open(progress_file, 'w') as f:
-            json.dump(existing_progress, f)
+        with _progress_write_lock:
+            _write_progress_file(job_dir, existing_progress)
         
         # Fast generation mode - Python calculations only, no Excel I/O
         # This takes ~3-5 seconds instead of ~50 seconds
+        generate_rate_card_fast(job_dir, mapping_config, merchant_pricing)
+    except Exception as e:
+        app.logger.exception('Rate card generation failed')
         try:
-            generate_rate_card_fast(job_dir, mapping_config, merchant_pricing)
-            return jsonify({'success': True, 'status': 'completed'})
-        except Exception as e:
             write_error(job_dir, f'Generation failed: {str(e)}')
-            return jsonify({'error': f'Generation failed: {str(e)}'}), 500
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        except Exception:
+            pass
+    finally:
+        _release_generation(job_dir)
+
+def _read_progress(job_dir):
+    """Return a copy of progress.json, served from memory while the file is unchanged."""
+    progress_file = Path(job_dir) / 'progress.json'
+    try:
+        signature = _stat_signature(progress_file)
+    except FileNotFoundError:
+        return {}
+    cache_key = str(progress_file)
+    if signature is not None:
+        with _progress_cache_lock:
+            cached = _progress_cache.get(cache_key)
+            if cached and cached['signature'] == signature:
+                return copy.deepcopy(cached['progress'])
+    progress = _json_loads(progress_file.read_bytes())
+    _remember_progress(cache_key, progress, signature)
+    return progress
+
+def _remember_progress(cache_key, progress, signature):
+    with _progress_cache_lock:
+        _progress_cache.pop(cache_key, None)
+        if signature is None:
+            return
+        _progress_cache[cache_key] = {'progress': copy.deepcopy(progress), 'signature': signature}
+        while len(_progress_cache) > _PROGRESS_CACHE_SIZE:
+            _progress_cache.pop(next(iter(_progress_cache)))
+
+def _write_progress_file(job_dir, progress):
+    """Atomically replace progress.json and drop the cached copy."""
+    progress_file = Path(job_dir) / 'progress.json'
+    with tempfile.NamedTemporaryFile('wb', delete=False, dir=progress_file.parent, suffix='.tmp') as tmp:
+        tmp.write(_json_dumps_bytes(progress))
+    os.replace(tmp.name, progress_file)
+    # The new mtime is inside the race window, so the next read goes to disk anyway
+    _remember_progress(str(progress_file), progress, None)
 
 def write_progress(job_dir, step, value=True):
     """Write progress update with timestamp for phase tracking"""
-    progress_file = job_dir / 'progress.json'
-    progress = {}
-    if progress_file.exists():
-        with open(progress_file, 'r') as f:
-            progress = json.load(f)
-    progress[step] = value
-    if 'phase_timestamps' not in progress:
-        progress['phase_timestamps'] = {}
-    progress['phase_timestamps'][step] = datetime.now(timezone.utc).isoformat()
-    with open(progress_file, 'w') as f:
-        json.dump(progress, f)
+    with _progress_write_lock:
+        progress = _read_progress(job_dir)
+        progress[step] = value
+        if 'phase_timestamps' not in progress:
+            progress['phase_timestamps'] = {}
+        progress['phase_timestamps'][step] = datetime.now(timezone.utc).isoformat()
+        _write_progress_file(job_dir, progress)
 
 def _load_progress_stats():
     """Load historical phase timings to estimate ETA."""
@@ -5768,7 +6204,7 @@ def _load_progress_stats():
         with _PROGRESS_STATS_LOCK:
             if _PROGRESS_STATS_FILE.exists():
                 with open(_PROGRESS_STATS_FILE, 'r') as f:
-                    stats = json.load(f)
+                    stats = _json_load(f)
     except Exception:
         stats = {'phases': {}}
     if 'phases' not in stats:
@@ -5781,7 +6217,7 @@ def _write_progress_stats(stats):
     stats['last_updated'] = datetime.now(timezone.utc).isoformat()
     with _PROGRESS_STATS_LOCK:
         with open(_PROGRESS_STATS_FILE, 'w') as f:
-            json.dump(stats, f)
+            _json_dump(stats, f)
 
 def _compute_phase_durations(timestamps):
     """Compute durations between generator phases."""
@@ -5810,14 +6246,12 @@ def _compute_phase_durations(timestamps):
 
 def _record_progress_stats(job_dir):
     """Capture finished phase durations for future ETA estimates."""
-    progress_file = job_dir / 'progress.json'
-    if not progress_file.exists():
-        return
     try:
-        with open(progress_file, 'r') as f:
-            progress = json.load(f)
+        progress = _read_progress(job_dir)
     except Exception:
         return
+    if not progress:
+        return
     timestamps = progress.get('phase_timestamps', {})
     durations = _compute_phase_durations(timestamps)
     if not durations:
@@ -5888,14 +6322,12 @@ def _calculate_eta(progress):
 
 def write_error(job_dir, message):
     """Write error to progress file."""
-    progress_file = job_dir / 'progress.json'
-    progress = {}
-    if progress_file.exists():
-        with open(progress_file, 'r') as f:
-            progress = json.load(f)
-    progress['error'] = message
-    with open(progress_file, 'w') as f:
-        json.dump(progress, f)
+    with _progress_write_lock:
+        progress = _read_progress(job_dir)
+        if progress.get('error') == message:
+            return
+        progress['error'] = message
+        _write_progress_file(job_dir, progress)
 
 def _col_to_letter(col):
     """Convert column number to Excel letter (1=A, 27=AA, etc.)"""
@@ -6106,15 +6538,8 @@ def generate_rate_card(job_dir, mapping_config, merchant_pricing):
     write_progress(job_dir, 'normalize', True)
     write_progress(job_dir, 'qualification', True)
     
-    # Find template
-    template_path = Path('#New Template - Rate Card.xlsx')
-    if not template_path.exists():
-        template_path = Path('Rate Card Template.xlsx')
-    if not template_path.exists():
-        raise FileNotFoundError("Template file not found")
-    
-    # Load template with openpyxl
-    wb = openpyxl.load_workbook(template_path, keep_vba=False, data_only=False)
+    # Load template from the parsed-workbook cache (re-parsed only when the template mtime changes)
+    wb = _get_parsed_workbook()
     logging.info(f"Template loaded")
     
     if 'Raw Data' not in wb.sheetnames:
@@ -6133,9 +6558,9 @@ def generate_rate_card(job_dir, mapping_config, merchant_pricing):
     redo_file = job_dir / 'redo_carriers.json'
     if redo_file.exists():
         with open(redo_file, 'r') as f:
-            redo_config = json.load(f)
+            redo_config = _json_load(f)
     
-    normalized_df = pd.read_csv(job_dir / 'normalized.csv')
+    normalized_df = _read_normalized_frame(job_dir)
     origin_zip_value = extract_origin_zip(mapping_config.get('origin_zip'))
     
     write_progress(job_dir, 'write_template', True)
@@ -6159,12 +6584,13 @@ def generate_rate_card(job_dir, mapping_config, merchant_pricing):
         'Zone': 'ZONE'
     }
     
-    # Build column index map for data columns (skip formula columns)
-    formula_cols = set()
-    for col_idx in range(1, ws.max_column + 1):
-        cell = ws.cell(2, col_idx)
-        if cell.value and str(cell.value).startswith('='):
-            formula_cols.add(col_idx)
+    # Build column index map for data columns (skip formula columns).
+    # The template already carries row-relative formulas down the whole
+    # Automate3 table, so row 2 is enough to know which columns to leave alone.
+    formula_cols = frozenset(
+        cell.column for cell in ws[2]
+        if isinstance(cell.value, str) and cell.value.startswith('=')
+    )
     
     # Write data to Raw Data sheet
     start_row = 2
@@ -6179,33 +6605,70 @@ def generate_rate_card(job_dir, mapping_config, merchant_pricing):
         included_services = default_included_services(available_services)
     normalized_selected_services = {normalize_service_name(s) for s in included_services}
     
-    for row_idx in range(len(normalized_df)):
-        excel_row = start_row + row_idx
-        row_data = normalized_df.iloc[row_idx]
-        
-        for df_field, excel_col in field_to_excel.items():
-            col_idx = header_to_col.get(excel_col)
-            if col_idx and col_idx not in formula_cols and df_field in normalized_df.columns:
-                value = row_data.get(df_field)
-                if pd.notna(value):
-                    ws.cell(excel_row, col_idx).value = value
-        
-        # ORIGIN_ZIP_CODE fallback
-        origin_col = header_to_col.get('ORIGIN_ZIP_CODE')
-        if origin_col and origin_col not in formula_cols and origin_zip_value:
-            cell = ws.cell(excel_row, origin_col)
-            if cell.value is None or pd.isna(cell.value):
-                cell.value = origin_zip_value
-        
-        # MERCHANT_ID
-        if m_col and m_col not in formula_cols and m_id:
-            ws.cell(excel_row, m_col).value = m_id
-        
-        # QUALIFIED - TRUE if service level is selected, FALSE otherwise
-        if qualified_col and qualified_col not in formula_cols:
-            service_value = row_data.get('CLEANED_SHIPPING_SERVICE', '')
-            is_qualified = normalize_service_name(str(service_value)) in normalized_selected_services if service_value else False
-            ws.cell(excel_row, qualified_col).value = is_qualified
+    row_count = len(normalized_df)
+    
+    # ORIGIN_ZIP_CODE fallback fills rows the normalized data leaves blank. The
+    # template's data columns are empty below the header, so this is decided
+    # from the Series while buffering rather than by re-reading every cell.
+    origin_col = header_to_col.get('ORIGIN_ZIP_CODE')
+    origin_fallback = origin_col and origin_col not in formula_cols and origin_zip_value
+    
+    # Phase 1: buffer every output column as a plain list (None = leave cell untouched)
+    column_buffers = {}
+    for df_field, excel_col in field_to_excel.items():
+        col_idx = header_to_col.get(excel_col)
+        if not col_idx or col_idx in formula_cols or df_field not in normalized_df.columns:
+            continue
+        series = normalized_df[df_field]
+        fill_value = origin_zip_value if origin_fallback and col_idx == origin_col else None
+        column_buffers[col_idx] = [
+            value if is_present else fill_value
+            for value, is_present in zip(series.tolist(), series.notna().tolist())
+        ]
+    
+    if origin_fallback and origin_col not in column_buffers:
+        column_buffers[origin_col] = [origin_zip_value] * row_count
+    
+    # MERCHANT_ID
+    if m_col and m_col not in formula_cols and m_id:
+        column_buffers[m_col] = [m_id] * row_count
+    
+    # QUALIFIED - TRUE if service level is selected, FALSE otherwise
+    if qualified_col and qualified_col not in formula_cols:
+        if 'CLEANED_SHIPPING_SERVICE' in normalized_df.columns:
+            # Normalize each distinct service once, then broadcast membership to every row
+            service_series = normalized_df['CLEANED_SHIPPING_SERVICE']
+            service_text = service_series.astype(str)
+            has_service = service_series.notna() & service_text.ne('')
+            qualified_by_service = {
+                service: normalize_service_name(service) in normalized_selected_services
+                for service in service_text[has_service].unique()
+            }
+            column_buffers[qualified_col] = (
+                service_text.map(qualified_by_service).where(has_service, False).astype(bool).tolist()
+            )
+        else:
+            column_buffers[qualified_col] = [False] * row_count
+    
+    # Phase 2: stream each buffered column into the sheet. Cells go straight into
+    # ws._cells (what ws.cell() does after its argument checks); existing template
+    # cells are updated in place so their styles survive.
+    last_row = start_row + row_count - 1
+    if last_row > 1048576:
+        raise ValueError(f"Row numbers must be between 1 and 1048576. Row number supplied was {last_row}")
+    data_rows = range(start_row, last_row + 1)
+    ws_cells = ws._cells
+    for col_idx, values in column_buffers.items():
+        for excel_row, value in zip(data_rows, values):
+            if value is None:
+                continue
+            cell = ws_cells.get((excel_row, col_idx))
+            if cell is None:
+                ws_cells[(excel_row, col_idx)] = Cell(ws, row=excel_row, column=col_idx, value=value)
+            else:
+                cell.value = value
+    if column_buffers and row_count:
+        ws._current_row = max(ws._current_row, last_row)
     
     logging.info(f"Raw Data written: {len(normalized_df)} rows")
     
@@ -6250,11 +6713,15 @@ def generate_rate_card(job_dir, mapping_config, merchant_pricing):
     
     temp_file = None
     try:
+        # Serialize in memory so the archive is validated before touching disk
+        # and lands in the temp file with one large write
+        buffer = BytesIO()
+        wb.save(buffer)
+        if not zipfile.is_zipfile(buffer):
+            raise Exception("Generated file is not a valid XLSX archive")
         with tempfile.NamedTemporaryFile(delete=False, dir=job_dir, suffix='.xlsx') as tmp:
             temp_file = Path(tmp.name)
-        wb.save(temp_file)
-        if not zipfile.is_zipfile(temp_file):
-            raise Exception("Generated file is not a valid XLSX archive")
+            tmp.write(buffer.getbuffer())
         os.replace(temp_file, output_path)
     except Exception as e:
         if temp_file and temp_file.exists():
@@ -6307,7 +6774,7 @@ def generate_rate_card_fast(job_dir, mapping_config, merchant_pricing):
     redo_file = job_dir / 'redo_carriers.json'
     if redo_file.exists():
         with open(redo_file, 'r') as f:
-            redo_config = json.load(f)
+            redo_config = _json_load(f)
     
     # Skip Excel template loading - go straight to Python calculations
     write_progress(job_dir, 'write_template', True)
@@ -6396,14 +6863,12 @@ def status(job_id=None):
         return jsonify({'error': 'Job not found'}), 404
     
     # Check progress file
-    progress_file = job_dir / 'progress.json'
-    progress = {}
-    if progress_file.exists():
-        with open(progress_file, 'r') as f:
-            progress = json.load(f)
+    progress = _read_progress(job_dir)
+    # While a run is in flight, errors and rate card files are the previous run's
+    running = _generation_running(job_dir)
     
     # Surface generation error if present
-    if 'error' in progress:
+    if 'error' in progress and not running:
         return jsonify({
             'ready': False,
             'error': progress['error'],
@@ -6413,17 +6878,10 @@ def status(job_id=None):
     # Check if generation is complete (dashboard ready)
     # In hybrid mode, the placeholder "* - Rate Card (Generating).xlsx" counts for dashboard readiness
     # The full Excel is generated in background and tracked separately
-    rate_card_files = list(job_dir.glob('* - Rate Card*.xlsx'))
-    is_complete = len(rate_card_files) > 0 or progress.get('excel_complete')
+    rate_card_files = _rate_card_files(job_dir)
+    is_complete = not running and (len(rate_card_files) > 0 or progress.get('excel_complete'))
     
     if is_complete:
-        # Load merchant name for redirect
-        merchant_name = 'Merchant'
-        mapping_file = job_dir / 'mapping.json'
-        if mapping_file.exists():
-            with open(mapping_file, 'r') as f:
-                config = json.load(f)
-                merchant_name = config.get('merchant_name', 'Merchant')
         return jsonify({
             'ready': True,
             'redirect_url': f'/dashboard?job_id={job_id}',
@@ -6478,24 +6936,15 @@ def dashboard_data(job_id):
         if not job_dir.exists():
             return jsonify({'error': 'Job not found'}), 404
         
-        mapping_file = job_dir / 'mapping.json'
-        mapping_config = {}
-        if mapping_file.exists():
-            with open(mapping_file, 'r') as f:
-                mapping_config = json.load(f)
-        
-        redo_file = job_dir / 'redo_carriers.json'
-        redo_config = {}
-        if redo_file.exists():
-            with open(redo_file, 'r') as f:
-                redo_config = json.load(f)
+        mapping_config = _load_job_json(job_dir / 'mapping.json')
+        redo_config = _load_job_json(job_dir / 'redo_carriers.json')
         
         annual_orders_missing = _annual_orders_missing(mapping_config)
         pct_off, dollar_off = _usps_market_discount_values(mapping_config)
         
         # Check if dashboard is ready (rate card file exists - placeholder or real)
         # In fast mode, we have a placeholder "* - Rate Card (Generating).xlsx"
-        rate_card_files = list(job_dir.glob('* - Rate Card*.xlsx'))
+        rate_card_files = _rate_card_files(job_dir)
         if not rate_card_files:
             return jsonify({'error': 'Rate card not found'}), 404
         
@@ -6592,7 +7041,8 @@ def dashboard_data(job_id):
         
         if not overall_metrics:
             overall_metrics = _calculate_metrics_fast(job_dir, selected_dashboard, mapping_config)
-            logging.info(f"Calculated new metrics for {selection_key}: {overall_metrics}")
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info(f"Calculated new metrics for {selection_key}: {overall_metrics}")
             if overall_metrics:
                 summary_cache[selection_key] = overall_metrics
                 _write_dashboard_cache(job_dir, carrier_metrics, summary_cache, current_hash)
@@ -6690,11 +7140,11 @@ def download_rate_card(job_id):
         }), 202
     
     # Find the real rate card file (not the placeholder)
-    rate_card_files = [f for f in job_dir.glob('* - Rate Card.xlsx') if '(Generating)' not in f.name]
+    rate_card_files = [f for f in _rate_card_files(job_dir) if f.name.endswith(' - Rate Card.xlsx')]
     if not rate_card_files:
         return jsonify({'error': 'Rate card not found'}), 404
     
-    return send_file(rate_card_files[0], as_attachment=True)
+    return _send_job_file(job_id, rate_card_files[0].name)
 
 @app.route('/api/annual-orders/<job_id>', methods=['POST'])
 def update_annual_orders(job_id):
@@ -6716,7 +7166,7 @@ def update_annual_orders(job_id):
             return jsonify({'error': 'Annual orders must be greater than 0'}), 400
 
         with open(mapping_file, 'r') as f:
-            mapping_config = json.load(f)
+            mapping_config = _json_load(f)
         mapping_config['annual_orders'] = annual_orders_value
         # Clear explicit eligibility overrides so volume-based calculation takes effect
         if 'amazon_eligible' in mapping_config:
@@ -6743,7 +7193,7 @@ def update_annual_orders(job_id):
         redo_file = job_dir / 'redo_carriers.json'
         if redo_file.exists():
             with open(redo_file, 'r') as f:
-                redo_config = json.load(f)
+                redo_config = _json_load(f)
             selected = redo_config.get('selected_carriers', [])
             changed = False
             if eligibility['amazon_eligible_final'] and 'Amazon' not in selected:
@@ -6766,7 +7216,7 @@ def update_annual_orders(job_id):
         pricing_file = job_dir / 'merchant_pricing.json'
         if pricing_file.exists():
             with open(pricing_file, 'r') as f:
-                merchant_pricing = json.load(f)
+                merchant_pricing = _json_load(f)
             excluded = merchant_pricing.get('excluded_carriers', [])
             changed = False
             if eligibility['amazon_eligible_final'] and 'Amazon' in excluded:
@@ -6846,7 +7296,7 @@ def update_usps_market_discount(job_id):
             return jsonify({'error': 'Discount values must be non-negative'}), 400
 
         with open(mapping_file, 'r') as f:
-            mapping_config = json.load(f)
+            mapping_config = _json_load(f)
         mapping_config['usps_market_pct_off'] = pct_off
         mapping_config['usps_market_dollar_off'] = dollar_off
         with open(mapping_file, 'w') as f:
@@ -6891,7 +7341,7 @@ def deal_sizing_data(job_id):
         if not mapping_file.exists():
             return jsonify({'error': 'Mapping not found'}), 404
         with open(mapping_file, 'r') as f:
-            mapping_config = json.load(f)
+            mapping_config = _json_load(f)
         selected_carriers = []
         if request.method == 'POST':
             payload = request.get_json(silent=True) or {}
@@ -6978,7 +7428,7 @@ def download_raw_invoice(job_id):
     if not raw_csv.exists():
         return jsonify({'error': 'File not found'}), 404
     
-    return send_file(raw_csv, as_attachment=True, download_name='raw_invoice.csv')
+    return _send_job_file(job_id, 'raw_invoice.csv')
 
 @app.route('/download/<job_id>/normalized')
 def download_normalized(job_id):
@@ -6989,7 +7439,19 @@ def download_normalized(job_id):
     if not normalized_csv.exists():
         return jsonify({'error': 'File not found'}), 404
     
-    return send_file(normalized_csv, as_attachment=True, download_name='normalized.csv')
+    return _send_job_file(job_id, 'normalized.csv')
+
+def _send_job_file(job_id, filename):
+    """Send a job file as an attachment, answering repeat requests with 304 while it is unchanged."""
+    return send_from_directory(
+        app.config['UPLOAD_FOLDER'],
+        f'{job_id}/{filename}',
+        as_attachment=True,
+        download_name=filename,
+        conditional=True,
+        etag=True,
+        max_age=0
+    )
 
 _resources_loaded = False
 _resources_lock = threading.Lock()
@@ -7024,6 +7486,11 @@ def _preload_resources():
             t0 = _time.time()
             _get_pricing_controls(str(template_path))
             logging.info(f"[PRELOAD] Pricing controls loaded in {_time.time() - t0:.2f}s")
+
+            t0 = _time.time()
+            _load_amazon_zips()
+            _load_uniuni_zips()
+            logging.info(f"[PRELOAD] Eligibility ZIP lists loaded in {_time.time() - t0:.2f}s")
             
             logging.info(f"[PRELOAD] All resources preloaded in {_time.time() - preload_start:.2f}s - workers are warm")
             _resources_loaded = True
@@ -243,6 +243,27 @@ def test_normalized_computed_fields_present(client, zone_based_csv):
     finally:
         os.unlink(csv_path)
 
+def _generate_and_wait(client, job_id, timeout=300):
+    """POST /api/generate, poll /api/status until ready, then wait for the background Excel."""
+    response = client.post('/api/generate', json={'job_id': job_id})
+    assert response.status_code == 200
+    assert json.loads(response.data)['status'] == 'started'
+
+    job_dir = Path(app.config['UPLOAD_FOLDER']) / job_id
+    deadline = time.time() + timeout
+    while True:
+        status = json.loads(client.get(f'/api/status/{job_id}').data)
+        assert 'error' not in status, status['error']
+        if status['ready']:
+            break
+        assert time.time() < deadline, "Timed out waiting for /api/status to report ready"
+        time.sleep(0.1)
+    while not ((job_dir / '.excel_ready').exists() or (job_dir / '.excel_failed').exists()):
+        assert time.time() < deadline, "Timed out waiting for the background Excel"
+        time.sleep(0.1)
+    assert not (job_dir / '.excel_failed').exists(), (job_dir / '.excel_failed').read_text()
+    return response
+
 def test_excel_generation_populates_fill_columns(client, zone_based_csv):
     """Test that fill columns are written into the Excel output"""
     import openpyxl
@@ -289,8 +310,7 @@ def test_excel_generation_populates_fill_columns(client, zone_based_csv):
         })
         assert response.status_code == 200
 
-        response = client.post('/api/generate', json={'job_id': job_id})
-        assert response.status_code == 200
+        _generate_and_wait(client, job_id)
 
         job_dir = Path(app.config['UPLOAD_FOLDER']) / job_id
         rate_card_files = list(job_dir.glob('* - Rate Card.xlsx'))
@@ -455,8 +475,7 @@ def test_redo_carrier_use_in_pricing_written(client, zone_based_csv):
         with open(job_dir / 'redo_carriers.json', 'w') as f:
             json.dump({'selected_carriers': ['DHL', 'Amazon']}, f)
 
-        response = client.post('/api/generate', json={'job_id': job_id})
-        assert response.status_code == 200
+        _generate_and_wait(client, job_id)
 
         rate_card_files = list(job_dir.glob('* - Rate Card.xlsx'))
         assert rate_card_files, "Expected a generated rate card file"
@@ -545,8 +564,7 @@ def test_pricing_summary_overwrite_use_in_pricing(client, zone_based_csv):
         with open(job_dir / 'redo_carriers.json', 'w') as f:
             json.dump({'selected_carriers': ['DHL']}, f)
 
-        response = client.post('/api/generate', json={'job_id': job_id})
-        assert response.status_code == 200
+        _generate_and_wait(client, job_id)
 
         rate_card_files = list(job_dir.glob('* - Rate Card.xlsx'))
         assert rate_card_files, "Expected a generated rate card file"
@@ -853,8 +871,7 @@ def test_excel_generation_preserves_formulas(client, zone_based_csv):
         assert response.status_code == 200
         
         # Generate
-        response = client.post('/api/generate', json={'job_id': job_id})
-        assert response.status_code == 200
+        _generate_and_wait(client, job_id)
         
         # Check generated file
         job_dir = Path(app.config['UPLOAD_FOLDER']) / job_id
@@ -926,8 +943,7 @@ def test_qualified_written_true_false_based_on_selected_services(client, zone_ba
         assert response.status_code == 200
         
         # Generate
-        response = client.post('/api/generate', json={'job_id': job_id})
-        assert response.status_code == 200
+        _generate_and_wait(client, job_id)
         
         # Check generated file
         job_dir = Path(app.config['UPLOAD_FOLDER']) / job_id
@@ -1001,8 +1017,7 @@ def test_merchant_pricing_controls_qualified_and_carriers(client, carrier_servic
                 'included_services': included_services
             })
             assert response.status_code == 200
-            response = client.post('/api/generate', json={'job_id': job_id})
-            assert response.status_code == 200
+            _generate_and_wait(client, job_id)
 
             deadline = time.time() + 5
             rate_card = None
@@ -1048,5 +1063,246 @@ def test_merchant_pricing_controls_qualified_and_carriers(client, carrier_servic
     finally:
         os.unlink(csv_path)
 
+def _make_generation_job(job_id):
+    job_dir = Path(app.config['UPLOAD_FOLDER']) / job_id
+    job_dir.mkdir()
+    with open(job_dir / 'mapping.json', 'w') as f:
+        json.dump({'merchant_name': 'Test Merchant'}, f)
+    return job_dir
+
+def _wait_for_status(client, job_id, predicate, timeout=10):
+    deadline = time.time() + timeout
+    while True:
+        status = json.loads(client.get(f'/api/status/{job_id}').data)
+        if predicate(status):
+            return status
+        assert time.time() < deadline, f"Unexpected status: {status}"
+        time.sleep(0.02)
+
+def test_generate_starts_in_background_and_status_polls_to_ready(client, monkeypatch):
+    """A retry does not show the previous run's error or output, and a second start joins the running one."""
+    import threading
+    import app as app_module
+
+    release = threading.Event()
+    calls = []
+
+    def fake_generate(job_dir, mapping_config, merchant_pricing):
+        calls.append(job_dir.name)
+        assert release.wait(10)
+        (job_dir / 'Test Merchant - Rate Card (Generating).xlsx').write_bytes(b'')
+        app_module.write_progress(job_dir, 'excel_complete', True)
+
+    monkeypatch.setattr(app_module, '_preload_resources', lambda: None)
+    monkeypatch.setattr(app_module, 'generate_rate_card_fast', fake_generate)
+
+    job_dir = _make_generation_job('async-job')
+    # Leftovers of a failed and a finished earlier run
+    with open(job_dir / 'progress.json', 'w') as f:
+        json.dump({'error': 'Generation failed: boom', 'excel_complete': True, 'saving': True}, f)
+    (job_dir / 'Test Merchant - Rate Card.xlsx').write_bytes(b'')
+
+    response = client.post('/api/generate', json={'job_id': 'async-job'})
+    assert json.loads(response.data)['status'] == 'started'
+    response = client.post('/api/generate', json={'job_id': 'async-job'})
+    assert json.loads(response.data)['status'] == 'started'
+
+    status = json.loads(client.get('/api/status/async-job').data)
+    assert 'error' not in status
+    assert status['ready'] is False
+    assert not status['progress'].get('saving')
+    # The last good rate card is kept; status ignores it while the run is in flight
+    assert (job_dir / 'Test Merchant - Rate Card.xlsx').exists()
+
+    release.set()
+    status = _wait_for_status(client, 'async-job', lambda s: s['ready'])
+    assert status['redirect_url'] == '/dashboard?job_id=async-job'
+    assert calls == ['async-job']
+
+def test_generate_joins_a_run_claimed_by_another_worker(client, monkeypatch):
+    import app as app_module
+
+    calls = []
+    monkeypatch.setattr(app_module, '_preload_resources', lambda: None)
+    monkeypatch.setattr(app_module, 'generate_rate_card_fast', lambda *args: calls.append(args))
+
+    job_dir = _make_generation_job('claimed-job')
+    with open(job_dir / 'progress.json', 'w') as f:
+        json.dump({'excel_complete': True}, f)
+    (job_dir / 'Test Merchant - Rate Card.xlsx').write_bytes(b'')
+    # Another worker process holds the marker while its run is in flight
+    (job_dir / app_module.GENERATION_MARKER).touch()
+
+    response = client.post('/api/generate', json={'job_id': 'claimed-job'})
+    assert json.loads(response.data)['status'] == 'started'
+    status = json.loads(client.get('/api/status/claimed-job').data)
+    assert status['ready'] is False
+    assert (job_dir / 'Test Merchant - Rate Card.xlsx').exists()
+    assert json.loads((job_dir / 'progress.json').read_text()) == {'excel_complete': True}
+
+    (job_dir / app_module.GENERATION_MARKER).unlink()
+    status = json.loads(client.get('/api/status/claimed-job').data)
+    assert status['ready'] is True
+    assert calls == []
+
+def test_generate_failure_is_reported_and_cleared_on_retry(client, monkeypatch):
+    import app as app_module
+
+    outcomes = [RuntimeError('boom')]
+
+    def fake_generate(job_dir, mapping_config, merchant_pricing):
+        if outcomes:
+            raise outcomes.pop()
+        (job_dir / 'Test Merchant - Rate Card (Generating).xlsx').write_bytes(b'')
+        app_module.write_progress(job_dir, 'excel_complete', True)
+
+    monkeypatch.setattr(app_module, '_preload_resources', lambda: None)
+    monkeypatch.setattr(app_module, 'generate_rate_card_fast', fake_generate)
+    _make_generation_job('retry-job')
+
+    client.post('/api/generate', json={'job_id': 'retry-job'})
+    status = _wait_for_status(client, 'retry-job', lambda s: 'error' in s)
+    assert status['error'] == 'Generation failed: boom'
+
+    client.post('/api/generate', json={'job_id': 'retry-job'})
+    status = _wait_for_status(client, 'retry-job', lambda s: s['ready'] or 'error' in s)
+    assert 'error' not in status
+    assert status['ready'] is True
+
+def test_read_progress_sees_same_mtime_rewrite_from_another_writer(tmp_path):
+    from app import _read_progress, _stat_signature
+
+    progress_file = tmp_path / 'progress.json'
+    progress_file.write_text(json.dumps({'step': 'a'}))
+    # Fresh files are inside the race window and never served from memory
+    assert _stat_signature(progress_file) is None
+    old_ns = time.time_ns() - 10_000_000_000
+    os.utime(progress_file, ns=(old_ns, old_ns))
+    assert _read_progress(tmp_path) == {'step': 'a'}
+
+    # Another worker replaces the file with same-size content and the same mtime
+    replacement = tmp_path / 'progress.tmp'
+    replacement.write_text(json.dumps({'step': 'b'}))
+    os.utime(replacement, ns=(old_ns, old_ns))
+    os.replace(replacement, progress_file)
+    assert _read_progress(tmp_path) == {'step': 'b'}
+
+def test_read_normalized_frame_sees_same_mtime_rewrite(tmp_path):
+    from app import _read_normalized_frame
+
+    normalized_csv = tmp_path / 'normalized.csv'
+    old_ns = time.time_ns() - 10_000_000_000
+    normalized_csv.write_text('Zone,Label Cost\n5,1.5\n')
+    os.utime(normalized_csv, ns=(old_ns, old_ns))
+    assert _read_normalized_frame(tmp_path, columns=['Zone'])['Zone'].tolist() == [5]
+
+    # A mapping re-submit replaces the file within the same timestamp tick
+    replacement = tmp_path / 'normalized.tmp'
+    replacement.write_text('Zone,Label Cost\n7,1.5\n')
+    os.utime(replacement, ns=(old_ns, old_ns))
+    os.replace(replacement, normalized_csv)
+    assert _read_normalized_frame(tmp_path, columns=['Zone'])['Zone'].tolist() == [7]
+
+def test_rate_card_files_not_cached_while_directory_is_fresh(tmp_path):
+    from app import _rate_card_files
+
+    assert _rate_card_files(tmp_path) == []
+    # Added within the same timestamp tick as the previous change
+    (tmp_path / 'Test Merchant - Rate Card.xlsx').write_bytes(b'')
+    assert [p.name for p in _rate_card_files(tmp_path)] == ['Test Merchant - Rate Card.xlsx']
+
+def test_normalized_parquet_matches_csv_read_back(tmp_path):
+    import numpy as np
+    from app import _read_normalized_frame, _write_normalized_frame
+
+    frame = pd.DataFrame({
+        'Zip': ['02134', '94105', ''],
+        'ORIGIN_ZIP_CODE': ['', '', ''],
+        'Shipping Service': ['UPS Ground', 'NA', None],
+        'Label Cost': [5.5, np.nan, 7.25],
+        'Flag': ['True', 'False', 'True'],
+        'Zone': pd.Series(['5', 'n/a', '7'], dtype=object),
+    })
+    _write_normalized_frame(tmp_path, frame)
+    assert (tmp_path / 'normalized.parquet').exists()
+    pd.testing.assert_frame_equal(_read_normalized_frame(tmp_path), pd.read_csv(tmp_path / 'normalized.csv'))
+def _reference_mode_or_min(series):
+    series = series.dropna()
+    if series.empty:
+        return None
+    counts = series.value_counts()
+    max_count = counts.max()
+    if max_count <= 1:
+        return float(series.min())
+    return float(min(counts[counts == max_count].index))
+
+def test_mode_or_min_by_zone_bucket_matches_per_group_mode():
+    from app import _mode_or_min_by_zone_bucket
+    import numpy as np
+
+    rng = np.random.default_rng(7)
+    frame = pd.DataFrame({
+        'zone': rng.integers(1, 9, 2000),
+        'weight_bucket': rng.choice([0.25, 0.5, 1.0, 2.0, 5.0], 2000),
+        'label_cost': rng.choice([4.5, 5.25, 6.0, 7.75, np.nan], 2000),
+    })
+    # Hand-built groups: a tie, all-unique costs, and costs that are all missing
+    frame = pd.concat([frame, pd.DataFrame({
+        'zone': [10, 10, 10, 10, 11, 11, 11, 12],
+        'weight_bucket': [1.0] * 8,
+        'label_cost': [9.0, 9.0, 3.0, 3.0, 8.0, 2.0, 5.0, np.nan],
+    })], ignore_index=True)
+
+    expected = frame.groupby(['zone', 'weight_bucket'])['label_cost'].apply(_reference_mode_or_min).dropna()
+    result = _mode_or_min_by_zone_bucket(frame)
+
+    assert result.to_dict() == expected.astype(float).to_dict()
+    assert result[(10, 1.0)] == 3.0
+    assert result[(11, 1.0)] == 2.0
+    assert (12, 1.0) not in result.index
+    assert _mode_or_min_by_zone_bucket(frame.iloc[:0]).empty
+def test_redo_winner_prefers_cheapest_then_carrier_priority():
+    from app import CARRIER_PRIORITY, _priority_carrier_tables, _redo_winner
+
+    first, second = CARRIER_PRIORITY[0], CARRIER_PRIORITY[1]
+    rate_tables = {
+        first: {1: {5: 7.0}, 2: {5: 6.0}},
+        second: {1: {5: 7.0}, 2: {5: 5.5}, 3: {5: 4.0}},
+    }
+    # Selection order must not decide ties
+    tables = _priority_carrier_tables([second, first, 'Unranked'], rate_tables)
+    assert [carrier for carrier, _ in tables] == [first, second, 'Unranked']
+
+    assert _redo_winner(tables, 1, 5) == (first, 7.0)
+    assert _redo_winner(tables, 2, 5) == (second, 5.5)
+    assert _redo_winner(tables, 3, 5) == (second, 4.0)
+    assert _redo_winner(tables, 1, 8) == (None, None)
+    assert _redo_winner(tables, 99, 5) == (None, None)
+def test_clean_old_runs_sweeps_at_most_once_per_interval(client, monkeypatch):
+    import app as app_module
+
+    monkeypatch.setattr(app_module, '_last_clean_runs', None)
+    runs_dir = Path(app.config['UPLOAD_FOLDER'])
+    expired_ns = time.time_ns() - 2 * 24 * 3600 * 10**9
+
+    def make_expired_run(name):
+        run_dir = runs_dir / name
+        run_dir.mkdir()
+        os.utime(run_dir, ns=(expired_ns, expired_ns))
+        return run_dir
+
+    first = make_expired_run('expired-1')
+    app_module.clean_old_runs()
+    assert not first.exists()
+
+    second = make_expired_run('expired-2')
+    app_module.clean_old_runs()
+    assert second.exists()
+
+    monkeypatch.setattr(
+        app_module, '_last_clean_runs', time.monotonic() - app_module.CLEAN_RUNS_INTERVAL_SECONDS - 1
+    )
+    app_module.clean_old_runs()
+    assert not second.exists()
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])